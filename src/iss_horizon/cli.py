@@ -3,31 +3,53 @@
 from __future__ import annotations
 
 import argparse
+import dataclasses
+import functools
 import getpass
+import io
 import json
 import os
+import re
 import sys
-from collections.abc import Mapping
+from collections.abc import Callable, Mapping
 from datetime import UTC, datetime
 from pathlib import Path
-
-import requests
+from typing import IO, TYPE_CHECKING, Any
 
 from iss_horizon.config import Config
-from iss_horizon.geo import LocationResolver
-from iss_horizon.mailer import send_mail
 from iss_horizon.models import ISSHorizonError, SMTPConfig, VisibilityWindow
-from iss_horizon.predictor import ISSPredictor
-from iss_horizon.report import format_monthly_report, format_monthly_report_html, month_range_for
-
 
-def _stars_text(stars: int) -> str:
-    if not 1 <= stars <= 5:
-        raise ValueError("stars must be in 1..5")
-    return "★" * stars + "☆" * (5 - stars)
+if TYPE_CHECKING:
+    import requests
+
+# Subcommand dependencies (requests, geopy, timezonefinder, skyfield) are imported
+# inside the functions that need them so `--help` and argument errors stay fast.
+
+# City, region and country keys used by the supported IP geolocation payload shapes
+# (ipapi.co, ipwho.is, ip-api.com, ipinfo.io, IP2Location.io), in preference order.
+_IP_PAYLOAD_FIELDS = (
+    ("city", "city_name"),
+    ("region", "regionName", "region_name"),
+    ("country_name", "country"),
+)
+# KEY=value assignments; one optional pair of surrounding quotes is dropped from the value.
+_ENV_LINE_RE = re.compile(
+    r"^[ \t]*(?P<key>[A-Za-z_][A-Za-z0-9_]*)[ \t]*=[ \t]*[\"']?(?P<value>.*?)[\"']?[ \t]*\r?$",
+    re.MULTILINE,
+)
+_ENV_ESCAPES = str.maketrans({"\\": "\\\\", '"': '\\"'})
+_VOID_TAGS = frozenset({"meta", "br", "hr", "img", "input", "link"})
+_TAG_NAME_RE = re.compile(r"<\s*/?\s*([A-Za-z][A-Za-z0-9]*)")
+_INDENTS = tuple("  " * depth for depth in range(32))
+# One match per output line: split between adjacent tags ("><") and at line breaks.
+_HTML_LINE_RE = re.compile(r"[^\r\n]+?(?:>(?=<)|(?=[\r\n])|$)")
+_NON_ASCII_RE = re.compile(r"[^\x00-\x7f]")
 
 
 def _window_to_dict(window: VisibilityWindow) -> dict[str, object]:
+    # Windows only exist once the predictor (and NumPy) has been imported.
+    from iss_horizon.utils import stars_text
+
     return {
         "start_local": window.start_local.isoformat(),
         "end_local": window.end_local.isoformat(),
@@ -41,38 +63,88 @@ def _window_to_dict(window: VisibilityWindow) -> dict[str, object]:
         "peak_direction": window.peak_direction,
         "end_direction": window.end_direction,
         "visibility_stars": window.visibility_stars,
-        "visibility_label": _stars_text(window.visibility_stars),
+        "visibility_label": stars_text(window.visibility_stars),
     }
 
 
-def _build_parser() -> argparse.ArgumentParser:
+def _escape_non_ascii(match: re.Match[str]) -> str:
+    # Same escapes as json.dumps(ensure_ascii=True), including surrogate pairs.
+    code = ord(match.group())
+    if code > 0xFFFF:
+        code -= 0x10000
+        return f"\\u{0xD800 | (code >> 10):04x}\\u{0xDC00 | (code & 0x3FF):04x}"
+    return f"\\u{code:04x}"
+
+
+def _dumps_json(payload: object) -> str:
+    """Serialize CLI JSON output, using orjson when the optional extra is installed.
+
+    Output is ASCII either way, so it does not depend on the extra or on the
+    encoding of stdout.
+    """
+
+    try:
+        import orjson
+    except ImportError:
+        return json.dumps(payload, indent=2)
+    text = str(orjson.dumps(payload, option=orjson.OPT_INDENT_2), "utf-8")
+    # Non-ASCII characters can only occur inside JSON strings, so escaping them in
+    # the whole document is safe.
+    return _NON_ASCII_RE.sub(_escape_non_ascii, text)
+
+
+def _add_next_arguments(parser: argparse.ArgumentParser) -> None:
+    parser.add_argument("--location", required=True)
+    parser.add_argument("--hours", type=int, default=48)
+    parser.add_argument("--min-elev", type=float)
+    parser.add_argument("--twilight", type=float)
+    parser.add_argument("--sample", type=int)
+    parser.add_argument("--json", action="store_true")
+
+
+def _add_month_arguments(parser: argparse.ArgumentParser) -> None:
+    parser.add_argument("--location", required=True)
+    parser.add_argument("--year", type=int, required=True)
+    parser.add_argument("--month", type=int, required=True)
+    parser.add_argument("--min-elev", type=float)
+    parser.add_argument("--twilight", type=float)
+    parser.add_argument("--sample", type=int)
+    parser.add_argument("--send", action="store_true")
+    parser.add_argument("--email-to")
+    parser.add_argument("--html-out")
+
+
+def _add_config_arguments(parser: argparse.ArgumentParser) -> None:
+    """The `config` subcommand takes no arguments."""
+
+
+def _add_setup_arguments(parser: argparse.ArgumentParser) -> None:
+    parser.add_argument("--env-file", default=".env")
+    parser.add_argument("--test-email", action="store_true")
+
+
+_SUBCOMMANDS: dict[str, tuple[str, Callable[[argparse.ArgumentParser], None]]] = {
+    "next": ("Predict ISS windows for next N hours", _add_next_arguments),
+    "month": ("Generate ISS windows for a month", _add_month_arguments),
+    "config": ("Print effective non-secret config", _add_config_arguments),
+    "setup": ("Interactively create/update env configuration", _add_setup_arguments),
+}
+
+
+def _build_parser(command: str | None = None) -> argparse.ArgumentParser:
+    """Build the CLI parser, registering only `command` when it is a known subcommand.
+
+    Without a known command (no arguments, `--help`, typos) every subcommand is
+    registered so argparse can list them and report the usual errors.
+    """
+
     parser = argparse.ArgumentParser(prog="iss-horizon")
     sub = parser.add_subparsers(dest="command", required=True)
 
-    next_parser = sub.add_parser("next", help="Predict ISS windows for next N hours")
-    next_parser.add_argument("--location", required=True)
-    next_parser.add_argument("--hours", type=int, default=48)
-    next_parser.add_argument("--min-elev", type=float)
-    next_parser.add_argument("--twilight", type=float)
-    next_parser.add_argument("--sample", type=int)
-    next_parser.add_argument("--json", action="store_true")
-
-    month_parser = sub.add_parser("month", help="Generate ISS windows for a month")
-    month_parser.add_argument("--location", required=True)
-    month_parser.add_argument("--year", type=int, required=True)
-    month_parser.add_argument("--month", type=int, required=True)
-    month_parser.add_argument("--min-elev", type=float)
-    month_parser.add_argument("--twilight", type=float)
-    month_parser.add_argument("--sample", type=int)
-    month_parser.add_argument("--send", action="store_true")
-    month_parser.add_argument("--email-to")
-    month_parser.add_argument("--html-out")
-
-    sub.add_parser("config", help="Print effective non-secret config")
-
-    setup_parser = sub.add_parser("setup", help="Interactively create/update env configuration")
-    setup_parser.add_argument("--env-file", default=".env")
-    setup_parser.add_argument("--test-email", action="store_true")
+    for name, (help_text, add_arguments) in _SUBCOMMANDS.items():
+        if command in _SUBCOMMANDS and name != command:
+            continue
+        add_arguments(sub.add_parser(name, help=help_text))
     return parser
 
 
@@ -80,46 +152,78 @@ def _parse_env_file(path: Path) -> dict[str, str]:
     if not path.exists():
         return {}
 
-    values: dict[str, str] = {}
-    for line in path.read_text(encoding="utf-8").splitlines():
-        stripped = line.strip()
-        if not stripped or stripped.startswith("#") or "=" not in stripped:
-            continue
-        key, value = stripped.split("=", 1)
-        clean = value.strip().strip('"').strip("'")
-        values[key.strip()] = clean
-    return values
+    text = path.read_text(encoding="utf-8")
+    return {match["key"]: match["value"] for match in _ENV_LINE_RE.finditer(text)}
 
 
 def _location_from_ip_payload(payload: Mapping[str, object]) -> str | None:
-    city = str(payload.get("city", "")).strip()
-    region = str(payload.get("region") or payload.get("regionName") or "").strip()
-    country = str(payload.get("country_name") or payload.get("country") or "").strip()
+    parts: list[str] = []
+    for aliases in _IP_PAYLOAD_FIELDS:
+        for key in aliases:
+            value = payload.get(key)
+            text = str(value).strip() if value is not None else ""
+            if text:
+                parts.append(text)
+                break
 
-    parts = [part for part in (city, region, country) if part]
     if len(parts) >= 2:
         return ", ".join(parts)
     return None
 
 
+@functools.lru_cache(maxsize=1)
+def _ip_lookup_session() -> requests.Session:
+    """Return the process-wide session for IP geolocation providers.
+
+    Its pool holds one connection per provider host so the concurrent lookups do not
+    queue. Retries are left off: racing the providers is the failover.
+    """
+
+    import requests
+    from requests.adapters import HTTPAdapter
+
+    session = requests.Session()
+    session.headers.update({"User-Agent": "iss-horizon-setup/0.1"})
+    session.mount("https://", HTTPAdapter(pool_connections=4, pool_maxsize=8))
+    return session
+
+
+def _fetch_ip_location(session: requests.Session, endpoint: str) -> str | None:
+    import requests
+
+    try:
+        response = session.get(endpoint, timeout=3)
+        response.raise_for_status()
+        payload = response.json()
+    except (requests.RequestException, ValueError):
+        return None
+    if isinstance(payload, dict):
+        return _location_from_ip_payload(payload)
+    return None
+
+
 def _detect_location_from_ip() -> str | None:
-    headers = {"User-Agent": "iss-horizon-setup/0.1"}
+    from concurrent.futures import ThreadPoolExecutor, as_completed
+
     endpoints = [
         "https://ipapi.co/json/",
         "https://ipwho.is/",
     ]
 
-    for endpoint in endpoints:
-        try:
-            response = requests.get(endpoint, headers=headers, timeout=3)
-            response.raise_for_status()
-            payload = response.json()
-            if isinstance(payload, dict):
-                suggestion = _location_from_ip_payload(payload)
-                if suggestion:
-                    return suggestion
-        except (requests.RequestException, ValueError):
-            continue
+    # Query all providers at once so a slow one does not delay the fallback.
+    # The session's connection pool is shared by the worker threads.
+    session = _ip_lookup_session()
+    executor = ThreadPoolExecutor(max_workers=len(endpoints))
+    futures = [executor.submit(_fetch_ip_location, session, endpoint) for endpoint in endpoints]
+    try:
+        for future in as_completed(futures, timeout=4):
+            suggestion = future.result()
+            if suggestion:
+                return suggestion
+    except TimeoutError:
+        return None
+    finally:
+        executor.shutdown(wait=False, cancel_futures=True)
 
     return None
 
@@ -136,8 +240,7 @@ def _prompt_text(label: str, default: str | None = None, *, secret: bool = False
 
 
 def _env_line(key: str, value: str) -> str:
-    escaped = value.replace("\\", "\\\\").replace('"', '\\"')
-    return f'{key}="{escaped}"'
+    return f'{key}="{value.translate(_ENV_ESCAPES)}"'
 
 
 def _smtp_config_from_setup_inputs(
@@ -170,35 +273,49 @@ def _smtp_config_from_setup_inputs(
 def _beautify_html(html: str) -> str:
     """Pretty-print compact HTML for file output readability."""
 
-    void_tags = {"meta", "br", "hr", "img", "input", "link"}
-    tokens = html.replace("><", ">\n<").splitlines()
+    buf = io.StringIO()
+    _beautify_html_to(html, buf)
+    return buf.getvalue()
+
+
+def _beautify_html_to(html: str, out: IO[str]) -> None:
+    """Write pretty-printed HTML to `out` line by line.
+
+    Lines are split between adjacent tags and at CR/LF line breaks. Output matches
+    the earlier `splitlines()`-based formatter for generated report HTML; unlike it,
+    blank lines are dropped and other Unicode line separators are kept inline.
+    """
+
     indent = 0
-    pretty_lines: list[str] = []
 
-    for token in tokens:
-        line = token.strip()
+    for match in _HTML_LINE_RE.finditer(html):
+        line = match.group().strip()
         if line.startswith("</"):
             indent = max(indent - 1, 0)
 
-        pretty_lines.append(f"{'  ' * indent}{line}")
+        out.write(_INDENTS[indent] if indent < len(_INDENTS) else "  " * indent)
+        out.write(line)
+        out.write("\n")
 
         if not line.startswith("<") or line.startswith("</"):
             continue
         if line.startswith("<!") or line.endswith("/>"):
             continue
 
-        tag_name = line[1:].split()[0].split(">")[0].strip("/").lower()
-        if tag_name in void_tags:
+        tag_match = _TAG_NAME_RE.match(line)
+        tag_name = tag_match.group(1).lower() if tag_match else ""
+        if tag_name in _VOID_TAGS:
             continue
         if "</" in line[1:]:
             continue
 
         indent += 1
 
-    return "\n".join(pretty_lines) + "\n"
-
 
 def _run_setup(args: argparse.Namespace) -> int:
+    from iss_horizon.geo import LocationResolver
+    from iss_horizon.mailer import send_mail
+
     env_path = Path(args.env_file)
     existing = _parse_env_file(env_path)
     cfg = Config.from_env()
@@ -252,32 +369,41 @@ def _run_setup(args: argparse.Namespace) -> int:
         f"{resolved.resolved_name} ({resolved.latitude:.4f}, {resolved.longitude:.4f})"
     )
 
-    env_lines = [
-        "# Generated by: iss-horizon setup",
-        "# Keep this file private (contains credentials).",
-        "",
-        _env_line("ISS_LOCATION", location),
-        _env_line("REPORT_TO", report_to),
-        "",
-        _env_line("ISS_TLE_URL", existing.get("ISS_TLE_URL", cfg.tle_url)),
-        _env_line("ISS_TLE_NAME", existing.get("ISS_TLE_NAME", cfg.tle_name)),
-        _env_line("NOMINATIM_USER_AGENT", user_agent),
-        _env_line("ISS_MIN_ELEV_DEG", min_elev),
-        _env_line("ISS_TWILIGHT_DEG", twilight),
-        _env_line("ISS_SAMPLE_SECONDS", sample_seconds),
-        _env_line("ISS_MIN_WINDOW_SECONDS", min_window),
-        _env_line("ISS_PROJECT_URL", project_url),
-        "",
-        _env_line("SMTP_HOST", smtp_host),
-        _env_line("SMTP_PORT", smtp_port),
-        _env_line("SMTP_USER", smtp_user),
-        _env_line("SMTP_PASSWORD", smtp_password),
-        _env_line("SMTP_FROM", smtp_from),
-        _env_line("SMTP_TLS_MODE", smtp_tls_mode),
-        "",
-    ]
+    env_sections = (
+        (
+            ("ISS_LOCATION", location),
+            ("REPORT_TO", report_to),
+        ),
+        (
+            ("ISS_TLE_URL", existing.get("ISS_TLE_URL", cfg.tle_url)),
+            ("ISS_TLE_NAME", existing.get("ISS_TLE_NAME", cfg.tle_name)),
+            ("NOMINATIM_USER_AGENT", user_agent),
+            ("ISS_MIN_ELEV_DEG", min_elev),
+            ("ISS_TWILIGHT_DEG", twilight),
+            ("ISS_SAMPLE_SECONDS", sample_seconds),
+            ("ISS_MIN_WINDOW_SECONDS", min_window),
+            ("ISS_PROJECT_URL", project_url),
+        ),
+        (
+            ("SMTP_HOST", smtp_host),
+            ("SMTP_PORT", smtp_port),
+            ("SMTP_USER", smtp_user),
+            ("SMTP_PASSWORD", smtp_password),
+            ("SMTP_FROM", smtp_from),
+            ("SMTP_TLS_MODE", smtp_tls_mode),
+        ),
+    )
+
+    buf = io.StringIO()
+    buf.write("# Generated by: iss-horizon setup\n")
+    buf.write("# Keep this file private (contains credentials).\n")
+    for section in env_sections:
+        buf.write("\n")
+        for key, value in section:
+            buf.write(_env_line(key, value))
+            buf.write("\n")
 
-    env_path.write_text("\n".join(env_lines), encoding="utf-8")
+    env_path.write_text(buf.getvalue(), encoding="utf-8")
     print(f"Wrote configuration to {env_path}")
 
     if args.test_email:
@@ -306,29 +432,24 @@ def _run_setup(args: argparse.Namespace) -> int:
 
 
 def _config_with_overrides(base: Config, args: argparse.Namespace) -> Config:
-    min_elev_deg = (
-        args.min_elev if getattr(args, "min_elev", None) is not None else base.min_elev_deg
-    )
-    twilight_deg = (
-        args.twilight if getattr(args, "twilight", None) is not None else base.twilight_deg
-    )
-    sample_seconds = (
-        args.sample if getattr(args, "sample", None) is not None else base.sample_seconds
-    )
+    overrides: dict[str, Any] = {}
+    if getattr(args, "min_elev", None) is not None:
+        overrides["min_elev_deg"] = args.min_elev
+    if getattr(args, "twilight", None) is not None:
+        overrides["twilight_deg"] = args.twilight
+    if getattr(args, "sample", None) is not None:
+        overrides["sample_seconds"] = args.sample
 
-    return Config(
-        tle_url=base.tle_url,
-        tle_name=base.tle_name,
-        nominatim_user_agent=base.nominatim_user_agent,
-        min_elev_deg=min_elev_deg,
-        twilight_deg=twilight_deg,
-        sample_seconds=sample_seconds,
-        min_window_seconds=base.min_window_seconds,
-        project_url=base.project_url,
-    )
+    if not overrides:
+        return base
+    return dataclasses.replace(base, **overrides)
 
 
 def _run_next(args: argparse.Namespace) -> int:
+    from iss_horizon.geo import LocationResolver
+    from iss_horizon.predictor import ISSPredictor
+    from iss_horizon.report import format_monthly_report
+
     base_config = Config.from_env()
     config = _config_with_overrides(base_config, args)
     resolver = LocationResolver(user_agent=config.nominatim_user_agent)
@@ -348,7 +469,7 @@ def _run_next(args: argparse.Namespace) -> int:
             "count": len(windows),
             "windows": [_window_to_dict(window) for window in windows],
         }
-        print(json.dumps(payload, indent=2))
+        print(_dumps_json(payload))
         return 0
 
     month_label = datetime.now(loc.timezone).strftime("%Y-%m")
@@ -368,6 +489,15 @@ def _run_next(args: argparse.Namespace) -> int:
 
 
 def _run_month(args: argparse.Namespace) -> int:
+    from iss_horizon.geo import LocationResolver
+    from iss_horizon.mailer import send_mail
+    from iss_horizon.predictor import ISSPredictor
+    from iss_horizon.report import (
+        format_monthly_report,
+        format_monthly_report_html,
+        month_range_for,
+    )
+
     base_config = Config.from_env()
     config = _config_with_overrides(base_config, args)
     resolver = LocationResolver(user_agent=config.nominatim_user_agent)
@@ -392,22 +522,26 @@ def _run_month(args: argparse.Namespace) -> int:
         min_window_seconds=config.min_window_seconds,
         project_url=config.project_url,
     )
-    report_html = format_monthly_report_html(
-        loc,
-        month_label,
-        windows,
-        min_elev_deg=config.min_elev_deg,
-        twilight_deg=config.twilight_deg,
-        sample_seconds=config.sample_seconds,
-        min_window_seconds=config.min_window_seconds,
-        project_url=config.project_url,
-    )
+    # Only the HTML file and the email need the HTML report.
+    report_html = ""
+    if args.html_out or args.send:
+        report_html = format_monthly_report_html(
+            loc,
+            month_label,
+            windows,
+            min_elev_deg=config.min_elev_deg,
+            twilight_deg=config.twilight_deg,
+            sample_seconds=config.sample_seconds,
+            min_window_seconds=config.min_window_seconds,
+            project_url=config.project_url,
+        )
     print(report_text)
 
     if args.html_out:
         html_path = Path(args.html_out).expanduser()
         html_path.parent.mkdir(parents=True, exist_ok=True)
-        html_path.write_text(_beautify_html(report_html), encoding="utf-8")
+        with html_path.open("w", encoding="utf-8") as html_file:
+            _beautify_html_to(report_html, html_file)
         print(f"HTML report written to {html_path}")
 
     if args.send:
@@ -424,7 +558,7 @@ def _run_month(args: argparse.Namespace) -> int:
     return 0
 
 
-def _run_config() -> int:
+def _run_config(args: argparse.Namespace) -> int:
     cfg = Config.from_env()
     data = {
         "ISS_TLE_URL": cfg.tle_url,
@@ -442,27 +576,33 @@ def _run_config() -> int:
         "SMTP_FROM": os.getenv("SMTP_FROM", "(derived)"),
         "SMTP_TLS_MODE": os.getenv("SMTP_TLS_MODE", "(derived)"),
     }
-    print(json.dumps(data, indent=2))
+    print(_dumps_json(data))
     return 0
 
 
+_DISPATCH: dict[str, Callable[[argparse.Namespace], int]] = {
+    "next": _run_next,
+    "month": _run_month,
+    "config": _run_config,
+    "setup": _run_setup,
+}
+
+
 def main(argv: list[str] | None = None) -> int:
     """Run CLI entrypoint and return POSIX-like exit code."""
 
-    parser = _build_parser()
+    if argv is None:
+        argv = sys.argv[1:]
+    parser = _build_parser(argv[0] if argv else None)
     args = parser.parse_args(argv)
 
-    try:
-        if args.command == "next":
-            return _run_next(args)
-        if args.command == "month":
-            return _run_month(args)
-        if args.command == "config":
-            return _run_config()
-        if args.command == "setup":
-            return _run_setup(args)
+    handler = _DISPATCH.get(args.command)
+    if handler is None:
         parser.print_help(sys.stderr)
         return 2
+
+    try:
+        return handler(args)
     except ISSHorizonError as exc:
         print(f"Error: {exc}", file=sys.stderr)
         return 1
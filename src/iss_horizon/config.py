@@ -2,13 +2,15 @@
 
 from __future__ import annotations
 
+import functools
 import os
 from dataclasses import dataclass
+from pathlib import Path
 
 from iss_horizon.models import SMTPConfig
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class Config:
     """Application configuration with env-backed defaults."""
 
@@ -22,20 +24,26 @@ class Config:
     project_url: str = ""
 
     @classmethod
+    @functools.lru_cache(maxsize=1)
     def from_env(cls) -> Config:
-        """Load config using environment variables with safe defaults."""
+        """Load config using environment variables with safe defaults.
 
+        The result is cached for the process; call `Config.from_env.cache_clear()`
+        after changing the environment to pick up new values.
+        """
+
+        defaults = cls()
         return cls(
-            tle_url=os.getenv("ISS_TLE_URL", cls.tle_url),
-            tle_name=os.getenv("ISS_TLE_NAME", cls.tle_name),
-            nominatim_user_agent=os.getenv("NOMINATIM_USER_AGENT", cls.nominatim_user_agent),
-            min_elev_deg=float(os.getenv("ISS_MIN_ELEV_DEG", str(cls.min_elev_deg))),
-            twilight_deg=float(os.getenv("ISS_TWILIGHT_DEG", str(cls.twilight_deg))),
-            sample_seconds=int(os.getenv("ISS_SAMPLE_SECONDS", str(cls.sample_seconds))),
+            tle_url=os.getenv("ISS_TLE_URL", defaults.tle_url),
+            tle_name=os.getenv("ISS_TLE_NAME", defaults.tle_name),
+            nominatim_user_agent=os.getenv("NOMINATIM_USER_AGENT", defaults.nominatim_user_agent),
+            min_elev_deg=float(os.getenv("ISS_MIN_ELEV_DEG", str(defaults.min_elev_deg))),
+            twilight_deg=float(os.getenv("ISS_TWILIGHT_DEG", str(defaults.twilight_deg))),
+            sample_seconds=int(os.getenv("ISS_SAMPLE_SECONDS", str(defaults.sample_seconds))),
             min_window_seconds=int(
-                os.getenv("ISS_MIN_WINDOW_SECONDS", str(cls.min_window_seconds))
+                os.getenv("ISS_MIN_WINDOW_SECONDS", str(defaults.min_window_seconds))
             ),
-            project_url=os.getenv("ISS_PROJECT_URL", cls.project_url).strip(),
+            project_url=os.getenv("ISS_PROJECT_URL", defaults.project_url).strip(),
         )
 
 
@@ -57,3 +65,18 @@ def smtp_config_from_env() -> SMTPConfig:
         from_addr=from_addr,
         tls_mode=tls_mode,
     )
+
+
+def cache_dir() -> Path:
+    """Return the directory for persistent caches (geocoding results, TLEs).
+
+    Uses `ISS_HORIZON_CACHE_DIR` if set, otherwise `$XDG_CACHE_HOME/iss-horizon`
+    with `~/.cache` as the XDG fallback.
+    """
+
+    override = os.getenv("ISS_HORIZON_CACHE_DIR", "").strip()
+    if override:
+        return Path(override).expanduser()
+    xdg_cache = os.getenv("XDG_CACHE_HOME", "").strip()
+    base = Path(xdg_cache).expanduser() if xdg_cache else Path.home() / ".cache"
+    return base / "iss-horizon"
@@ -2,15 +2,100 @@
 
 from __future__ import annotations
 
+import contextlib
+import functools
 import inspect
-from dataclasses import dataclass, field
+import json
+import time
+from dataclasses import dataclass, field, replace
+from pathlib import Path
 from typing import Any
+from zoneinfo import ZoneInfo
 
 from geopy.geocoders import Nominatim
 from timezonefinder import TimezoneFinder
 
+from iss_horizon.config import cache_dir
 from iss_horizon.models import Location, LocationResolutionError
 
+from .utils import atomic_write_text
+
+_DISK_CACHE_TTL_SECONDS = 30 * 24 * 3600.0
+
+
+@functools.lru_cache(maxsize=1)
+def _shared_tz_finder() -> TimezoneFinder:
+    """Return a process-wide TimezoneFinder; loading its polygon data is expensive."""
+
+    return TimezoneFinder()
+
+
+def _disk_cache_path() -> Path:
+    return cache_dir() / "locations.json"
+
+
+@functools.lru_cache(maxsize=4)
+def _load_disk_cache(path: Path) -> dict[str, dict[str, Any]]:
+    """Load persisted geocoding results once per process; unreadable files count as empty."""
+
+    try:
+        data = json.loads(path.read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return {}
+    return data if isinstance(data, dict) else {}
+
+
+def _cache_key(query: str) -> str:
+    return query.strip().casefold()
+
+
+def _entry_is_fresh(entry: object, now: float) -> bool:
+    if not isinstance(entry, dict):
+        return False
+    try:
+        return now - float(entry["cached_at"]) < _DISK_CACHE_TTL_SECONDS
+    except (KeyError, TypeError, ValueError):
+        return False
+
+
+def _location_from_disk_entry(query: str, entry: object) -> Location | None:
+    """Rebuild a cached location; malformed or expired entries count as a miss."""
+
+    if not isinstance(entry, dict) or not _entry_is_fresh(entry, time.time()):
+        return None
+    try:
+        tz_name = str(entry["timezone_name"])
+        return Location(
+            query=query,
+            resolved_name=str(entry["resolved_name"]),
+            latitude=float(entry["latitude"]),
+            longitude=float(entry["longitude"]),
+            timezone_name=tz_name,
+            timezone=ZoneInfo(tz_name),
+        )
+    # ZoneInfoNotFoundError is a KeyError.
+    except (KeyError, TypeError, ValueError):
+        return None
+
+
+def _store_disk_entry(key: str, location: Location) -> None:
+    path = _disk_cache_path()
+    entries = _load_disk_cache(path)
+    now = time.time()
+    # Drop expired and malformed entries so the file does not grow without bound.
+    for stale_key in [k for k, entry in entries.items() if not _entry_is_fresh(entry, now)]:
+        del entries[stale_key]
+    entries[key] = {
+        "resolved_name": location.resolved_name,
+        "latitude": location.latitude,
+        "longitude": location.longitude,
+        "timezone_name": location.timezone_name,
+        "cached_at": now,
+    }
+    # The disk cache is best-effort; resolution already succeeded.
+    with contextlib.suppress(OSError):
+        atomic_write_text(path, json.dumps(entries, indent=2, sort_keys=True))
+
 
 @dataclass
 class LocationResolver:
@@ -18,6 +103,12 @@ class LocationResolver:
 
     user_agent: str
     _cache: dict[str, Location] = field(default_factory=dict)
+    _geocoder: Nominatim | None = field(default=None, init=False, repr=False)
+
+    def _get_geocoder(self) -> Nominatim:
+        if self._geocoder is None:
+            self._geocoder = Nominatim(user_agent=self.user_agent)
+        return self._geocoder
 
     def resolve(self, query: str) -> Location:
         """Resolve a location query to immutable location data.
@@ -30,11 +121,21 @@ class LocationResolver:
         if not normalized_query:
             raise LocationResolutionError("Location query must not be empty")
 
-        if normalized_query in self._cache:
-            return self._cache[normalized_query]
-
-        geocoder = Nominatim(user_agent=self.user_agent)
-        geocoded_raw: Any = geocoder.geocode(normalized_query, exactly_one=True)
+        # Queries differing only in case or surrounding whitespace share cache entries.
+        key = _cache_key(normalized_query)
+        cached = self._cache.get(key)
+        if cached is None:
+            cached = _location_from_disk_entry(
+                normalized_query, _load_disk_cache(_disk_cache_path()).get(key)
+            )
+            if cached is not None:
+                self._cache[key] = cached
+        if cached is not None:
+            if cached.query != normalized_query:
+                cached = replace(cached, query=normalized_query)
+            return cached
+
+        geocoded_raw: Any = self._get_geocoder().geocode(normalized_query, exactly_one=True)
         if inspect.isawaitable(geocoded_raw):
             raise LocationResolutionError("Async geocoding result is not supported")
         if geocoded_raw is None:
@@ -49,16 +150,13 @@ class LocationResolver:
         lat = float(lat_value)
         lon = float(lon_value)
 
-        tz_finder = TimezoneFinder()
-        tz_name = tz_finder.timezone_at(lng=lon, lat=lat)
+        tz_name = _shared_tz_finder().timezone_at(lng=lon, lat=lat)
         if tz_name is None:
             raise LocationResolutionError(
                 f"Timezone could not be resolved for coordinates ({lat}, {lon})"
             )
 
         try:
-            from zoneinfo import ZoneInfo
-
             zone = ZoneInfo(tz_name)
         except Exception as exc:
             raise LocationResolutionError(
@@ -73,5 +171,6 @@ class LocationResolver:
             timezone_name=tz_name,
             timezone=zone,
         )
-        self._cache[normalized_query] = result
+        self._cache[key] = result
+        _store_disk_entry(key, result)
         return result
@@ -2,13 +2,117 @@
 
 from __future__ import annotations
 
+import contextlib
 import smtplib
+from collections.abc import Iterable
 from email.message import EmailMessage
+from types import TracebackType
 
 from iss_horizon.config import smtp_config_from_env
 from iss_horizon.models import EmailSendError, SMTPConfig
 
 
+class SMTPSession:
+    """Authenticated SMTP connection reused across several messages.
+
+    Connecting, negotiating TLS and logging in happen once on `__enter__`;
+    each `send` then only transmits a message.
+
+    Example:
+        with SMTPSession(cfg) as session:
+            for msg, to_addr in messages:
+                session.send(msg, to_addr)
+    """
+
+    def __init__(self, smtp_config: SMTPConfig | None = None) -> None:
+        cfg = smtp_config or smtp_config_from_env()
+        if not cfg.host:
+            raise EmailSendError("SMTP_HOST is required")
+        if cfg.tls_mode not in {"ssl", "starttls"}:
+            raise EmailSendError("SMTP_TLS_MODE must be 'ssl' or 'starttls'")
+        self.config = cfg
+        self._client: smtplib.SMTP | None = None
+
+    def __enter__(self) -> SMTPSession:
+        cfg = self.config
+        client: smtplib.SMTP | None = None
+        try:
+            if cfg.tls_mode == "ssl":
+                client = smtplib.SMTP_SSL(cfg.host, cfg.port, timeout=30)
+            else:
+                client = smtplib.SMTP(cfg.host, cfg.port, timeout=30)
+                client.ehlo()
+                client.starttls()
+                client.ehlo()
+            if cfg.user and cfg.password:
+                client.login(cfg.user, cfg.password)
+        except Exception as exc:  # pragma: no cover - covered via mocks
+            if client is not None:
+                client.close()
+            raise EmailSendError(f"Failed to connect to SMTP server {cfg.host}: {exc}") from exc
+        self._client = client
+        return self
+
+    def __exit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc: BaseException | None,
+        traceback: TracebackType | None,
+    ) -> None:
+        client, self._client = self._client, None
+        if client is None:
+            return
+        try:
+            client.quit()
+        except smtplib.SMTPException:  # pragma: no cover - connection already gone
+            client.close()
+
+    def send(self, msg: EmailMessage, to_addr: str) -> None:
+        """Send one message over the open connection.
+
+        Raises:
+            EmailSendError: If the session is not open or sending fails.
+        """
+
+        if self._client is None:
+            raise EmailSendError("SMTP session is not open")
+        try:
+            self._client.send_message(msg, to_addrs=[to_addr])
+        except smtplib.SMTPResponseException as exc:
+            # The server rejected this transaction; reset the envelope so the
+            # connection stays usable for the next message.
+            with contextlib.suppress(smtplib.SMTPException):
+                self._client.rset()
+            raise EmailSendError(f"Failed to send email to {to_addr}: {exc}") from exc
+        except Exception as exc:  # pragma: no cover - covered via mocks
+            raise EmailSendError(f"Failed to send email to {to_addr}: {exc}") from exc
+
+
+def build_message(
+    subject: str,
+    body: str,
+    *,
+    from_addr: str,
+    to_addr: str,
+    html_body: str | None = None,
+) -> EmailMessage:
+    """Build a report message that can be sent once or reused for several sends.
+
+    The HTML alternative is quoted-printable encoded, which keeps mostly-ASCII
+    markup close to its original size instead of growing it by a third as
+    base64 would.
+    """
+
+    msg = EmailMessage()
+    msg["Subject"] = subject
+    msg["From"] = from_addr
+    msg["To"] = to_addr
+    msg.set_content(body)
+    if html_body:
+        msg.add_alternative(html_body, subtype="html", cte="quoted-printable")
+    return msg
+
+
 def send_mail(
     subject: str,
     body: str,
@@ -30,33 +134,40 @@ def send_mail(
         EmailSendError: If config is invalid or sending fails.
     """
 
-    cfg = smtp_config or smtp_config_from_env()
-    if not cfg.host:
-        raise EmailSendError("SMTP_HOST is required")
-    if cfg.tls_mode not in {"ssl", "starttls"}:
-        raise EmailSendError("SMTP_TLS_MODE must be 'ssl' or 'starttls'")
+    session = SMTPSession(smtp_config)
+    msg = build_message(
+        subject, body, from_addr=session.config.from_addr, to_addr=to_addr, html_body=html_body
+    )
 
-    msg = EmailMessage()
-    msg["Subject"] = subject
-    msg["From"] = cfg.from_addr
-    msg["To"] = to_addr
-    msg.set_content(body)
-    if html_body:
-        msg.add_alternative(html_body, subtype="html")
-
-    try:
-        if cfg.tls_mode == "ssl":
-            with smtplib.SMTP_SSL(cfg.host, cfg.port, timeout=30) as client:
-                if cfg.user and cfg.password:
-                    client.login(cfg.user, cfg.password)
-                client.send_message(msg)
-        else:
-            with smtplib.SMTP(cfg.host, cfg.port, timeout=30) as client:
-                client.ehlo()
-                client.starttls()
-                client.ehlo()
-                if cfg.user and cfg.password:
-                    client.login(cfg.user, cfg.password)
-                client.send_message(msg)
-    except Exception as exc:  # pragma: no cover - covered via mocks
-        raise EmailSendError(f"Failed to send email to {to_addr}: {exc}") from exc
+    with session:
+        session.send(msg, to_addr)
+
+
+def send_mails(
+    messages: Iterable[tuple[EmailMessage, str]],
+    *,
+    smtp_config: SMTPConfig | None = None,
+) -> None:
+    """Send several messages over a single authenticated SMTP connection.
+
+    A message the server rejects does not stop the batch: the envelope is reset
+    and the remaining messages are still sent.
+
+    Args:
+        messages: Pairs of message and recipient address.
+        smtp_config: Optional explicit SMTP config. If omitted, values are loaded from env.
+
+    Raises:
+        EmailSendError: If config is invalid, the connection fails, or any message
+            could not be delivered.
+    """
+
+    failed: list[str] = []
+    with SMTPSession(smtp_config) as session:
+        for msg, to_addr in messages:
+            try:
+                session.send(msg, to_addr)
+            except EmailSendError:
+                failed.append(to_addr)
+    if failed:
+        raise EmailSendError(f"Failed to send email to {', '.join(failed)}")
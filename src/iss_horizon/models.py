@@ -27,7 +27,7 @@ class EmailSendError(ISSHorizonError):
     """Raised when sending a mail report fails."""
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class Location:
     """Resolved observer location with coordinates and timezone information."""
 
@@ -39,7 +39,7 @@ class Location:
     timezone: ZoneInfo
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class TLE:
     """Two-line element set for a satellite."""
 
@@ -48,7 +48,7 @@ class TLE:
     line2: str
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class VisibilityWindow:
     """Single local-time visibility segment for ISS observations."""
 
@@ -66,10 +66,12 @@ class VisibilityWindow:
     visibility_stars: int = 1
 
     def __post_init__(self) -> None:
-        for field_name in ("start_local", "end_local", "peak_local"):
-            value = getattr(self, field_name)
-            if value.tzinfo is None:
-                raise ValueError(f"{field_name} must be timezone-aware")
+        if self.start_local.tzinfo is None:
+            raise ValueError("start_local must be timezone-aware")
+        if self.end_local.tzinfo is None:
+            raise ValueError("end_local must be timezone-aware")
+        if self.peak_local.tzinfo is None:
+            raise ValueError("peak_local must be timezone-aware")
         if self.end_local < self.start_local:
             raise ValueError("end_local must not be before start_local")
         if self.duration.total_seconds() < 0:
@@ -77,8 +79,47 @@ class VisibilityWindow:
         if not 1 <= self.visibility_stars <= 5:
             raise ValueError("visibility_stars must be in 1..5")
 
-
-@dataclass(frozen=True)
+    @classmethod
+    def unchecked(
+        cls,
+        *,
+        start_local: datetime,
+        end_local: datetime,
+        peak_local: datetime,
+        duration: timedelta,
+        peak_elevation_deg: float,
+        start_azimuth_deg: float,
+        peak_azimuth_deg: float,
+        end_azimuth_deg: float,
+        start_direction: str,
+        peak_direction: str,
+        end_direction: str,
+        visibility_stars: int = 1,
+    ) -> VisibilityWindow:
+        """Build a window without running `__post_init__` validation.
+
+        Intended for internal producers such as the predictor; callers must
+        guarantee the same invariants that `__post_init__` checks.
+        """
+
+        window = object.__new__(cls)
+        set_field = object.__setattr__
+        set_field(window, "start_local", start_local)
+        set_field(window, "end_local", end_local)
+        set_field(window, "peak_local", peak_local)
+        set_field(window, "duration", duration)
+        set_field(window, "peak_elevation_deg", peak_elevation_deg)
+        set_field(window, "start_azimuth_deg", start_azimuth_deg)
+        set_field(window, "peak_azimuth_deg", peak_azimuth_deg)
+        set_field(window, "end_azimuth_deg", end_azimuth_deg)
+        set_field(window, "start_direction", start_direction)
+        set_field(window, "peak_direction", peak_direction)
+        set_field(window, "end_direction", end_direction)
+        set_field(window, "visibility_stars", visibility_stars)
+        return window
+
+
+@dataclass(frozen=True, slots=True)
 class MonthRange:
     """Timezone-aware local month boundaries."""
 
@@ -86,7 +127,7 @@ class MonthRange:
     end_local: datetime
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class SMTPConfig:
     """SMTP transport configuration for report delivery."""
 
@@ -3,17 +3,85 @@
 from __future__ import annotations
 
 from collections.abc import Sequence
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from datetime import UTC, datetime, timedelta
+from functools import cached_property
 from typing import Any
 
+import numpy as np
+import numpy.typing as npt
 from skyfield.api import EarthSatellite, Loader, Time, wgs84
 
 from iss_horizon.config import Config
-from iss_horizon.models import Location, PredictionError, VisibilityWindow
+from iss_horizon.models import TLE, Location, PredictionError, VisibilityWindow
 from iss_horizon.tle import fetch_tle
 
-from .utils import az_to_cardinal, contiguous_true_spans
+from .utils import az_to_cardinal_array, scan_spans, visibility_stars_batch
+
+FloatArray = npt.NDArray[np.float64]
+BoolArray = npt.NDArray[np.bool_]
+
+_SECONDS_PER_DAY = 86_400.0
+
+
+@dataclass(frozen=True, slots=True)
+class SampleBatch:
+    """Per-sample pass data held as parallel NumPy columns.
+
+    ``seconds`` are POSIX timestamps; the angular columns are in degrees. All columns
+    share one length, so a pass is a plain row slice of the batch.
+    """
+
+    seconds: FloatArray
+    alt: FloatArray
+    az: FloatArray
+    sun_alt: FloatArray
+    sunlit: BoolArray
+
+    @classmethod
+    def from_samples(
+        cls,
+        *,
+        sample_times_utc: Sequence[datetime] | FloatArray,
+        iss_alt_deg: Sequence[float] | FloatArray,
+        iss_az_deg: Sequence[float] | FloatArray,
+        sun_alt_deg: Sequence[float] | FloatArray,
+        iss_sunlit: Sequence[bool] | BoolArray,
+    ) -> SampleBatch:
+        """Build a batch from arrays or plain sequences, validating their lengths.
+
+        Sample times are either aware datetimes or an array of POSIX seconds.
+        """
+
+        if isinstance(sample_times_utc, np.ndarray):
+            seconds = sample_times_utc.astype(np.float64, copy=False)
+        else:
+            seconds = np.array([dt.timestamp() for dt in sample_times_utc], dtype=np.float64)
+        batch = cls(
+            seconds=seconds,
+            alt=np.asarray(iss_alt_deg, dtype=np.float64),
+            az=np.asarray(iss_az_deg, dtype=np.float64),
+            sun_alt=np.asarray(sun_alt_deg, dtype=np.float64),
+            sunlit=np.asarray(iss_sunlit, dtype=bool),
+        )
+        n = len(batch.seconds)
+        if not (n == len(batch.alt) == len(batch.az) == len(batch.sun_alt) == len(batch.sunlit)):
+            raise PredictionError("Sample arrays must have the same length")
+        return batch
+
+    def rows(self, first: int, last: int) -> SampleBatch:
+        """Return the samples ``first:last`` as views into this batch."""
+
+        return SampleBatch(
+            seconds=self.seconds[first:last],
+            alt=self.alt[first:last],
+            az=self.az[first:last],
+            sun_alt=self.sun_alt[first:last],
+            sunlit=self.sunlit[first:last],
+        )
+
+    def __len__(self) -> int:
+        return len(self.seconds)
 
 
 @dataclass
@@ -22,6 +90,48 @@ class ISSPredictor:
 
     config: Config
     loader: Loader = Loader("~/.skyfield")
+    _satellite_state: tuple[TLE, EarthSatellite] | None = field(
+        default=None, init=False, repr=False, compare=False
+    )
+
+    @cached_property
+    def ts(self) -> Any:
+        """Skyfield timescale, built once per predictor."""
+
+        return self.loader.timescale()
+
+    @cached_property
+    def eph(self) -> Any:
+        """Planetary ephemeris, loaded once per predictor."""
+
+        return self.loader("de421.bsp")
+
+    @cached_property
+    def earth(self) -> Any:
+        """Earth segment of the cached ephemeris."""
+
+        return self.eph["earth"]
+
+    @cached_property
+    def sun(self) -> Any:
+        """Sun segment of the cached ephemeris."""
+
+        return self.eph["sun"]
+
+    @property
+    def satellite(self) -> EarthSatellite:
+        """``EarthSatellite`` for the configured TLE, initialised once per distinct TLE.
+
+        ``fetch_tle`` is consulted on every access, which is a cache hit between
+        refreshes; SGP4 is only re-initialised when the returned element lines change.
+        """
+
+        tle = fetch_tle(self.config.tle_name, self.config.tle_url)
+        state = self._satellite_state
+        if state is None or (state[0].line1, state[0].line2) != (tle.line1, tle.line2):
+            state = (tle, EarthSatellite(tle.line1, tle.line2, tle.name, self.ts))
+            self._satellite_state = state
+        return state[1]
 
     def visible_windows_next_hours(self, loc: Location, hours: int) -> list[VisibilityWindow]:
         """Predict visible windows from now for a number of hours."""
@@ -43,13 +153,12 @@ class ISSPredictor:
             return []
 
         try:
-            ts = self.loader.timescale()
-            tle = fetch_tle(self.config.tle_name, self.config.tle_url)
-            satellite = EarthSatellite(tle.line1, tle.line2, tle.name, ts)
+            ts = self.ts
+            satellite = self.satellite
             observer = wgs84.latlon(loc.latitude, loc.longitude)
-            eph = self.loader("de421.bsp")
-            earth = eph["earth"]
-            sun = eph["sun"]
+            eph = self.eph
+            earth = self.earth
+            sun = self.sun
 
             t0 = ts.from_datetime(start_utc.astimezone(UTC))
             t1 = ts.from_datetime(end_utc.astimezone(UTC))
@@ -61,27 +170,27 @@ class ISSPredictor:
             )
 
             rise_time: Time | None = None
-            all_windows: list[VisibilityWindow] = []
+            passes: list[tuple[Time, Time]] = []
 
             for event_time, event_type in zip(event_times, event_types, strict=True):
                 if event_type == 0:
                     rise_time = event_time
                 elif event_type == 2 and rise_time is not None:
-                    pass_windows = self._predict_pass_windows(
-                        loc=loc,
-                        satellite=satellite,
-                        observer=observer,
-                        earth=earth,
-                        sun=sun,
-                        eph=eph,
-                        ts=ts,
-                        rise_time=rise_time,
-                        set_time=event_time,
-                    )
-                    all_windows.extend(pass_windows)
+                    passes.append((rise_time, event_time))
                     rise_time = None
 
-            return sorted(all_windows, key=lambda item: item.start_local)
+            # find_events reports passes chronologically and each pass yields its
+            # windows in sample order, so the result is already sorted by start time.
+            return self._predict_pass_windows(
+                loc=loc,
+                satellite=satellite,
+                observer=observer,
+                earth=earth,
+                sun=sun,
+                eph=eph,
+                ts=ts,
+                passes=passes,
+            )
         except Exception as exc:
             raise PredictionError(f"Failed to predict ISS visibility: {exc}") from exc
 
@@ -95,100 +204,150 @@ class ISSPredictor:
         sun: Any,
         eph: Any,
         ts: Any,
-        rise_time: Time,
-        set_time: Time,
+        passes: Sequence[tuple[Time, Time]],
     ) -> list[VisibilityWindow]:
-        """Predict visible segments within a single pass using fixed interval samples."""
+        """Predict visible segments for rise/set passes using fixed interval samples.
 
-        rise_dt = self._single_utc_datetime(rise_time)
-        set_dt = self._single_utc_datetime(set_time)
+        The samples of all passes are concatenated so Skyfield evaluates positions in
+        one batch; the results are then split back into per-pass slices.
+        """
 
-        samples_utc: list[datetime] = []
-        cursor = rise_dt
-        step = timedelta(seconds=self.config.sample_seconds)
-        while cursor <= set_dt:
-            samples_utc.append(cursor)
-            cursor += step
-        if samples_utc[-1] != set_dt:
-            samples_utc.append(set_dt)
+        if not passes:
+            return []
 
-        sample_times = ts.from_datetimes(samples_utc)
+        # Each pass is sampled every `sample_seconds` from rise, plus the exact set time.
+        # Offsets are built with NumPy and added to the rise time's two-part TT Julian
+        # date, so no per-sample datetime objects are created.
+        step = float(self.config.sample_seconds)
+        whole_parts: list[FloatArray] = []
+        fraction_parts: list[FloatArray] = []
+        posix_parts: list[FloatArray] = []
+        pass_bounds: list[tuple[int, int]] = []
+        first = 0
+        for rise_time, set_time in passes:
+            rise_dt = self._single_utc_datetime(rise_time)
+            set_dt = self._single_utc_datetime(set_time)
+            rise_tt = ts.from_datetime(rise_dt)
+
+            span_seconds = (set_dt - rise_dt).total_seconds()
+            offsets = np.append(np.arange(0.0, span_seconds, step), span_seconds)
+            whole_parts.append(np.full(len(offsets), rise_tt.whole))
+            fraction_parts.append(rise_tt.tt_fraction + offsets / _SECONDS_PER_DAY)
+            posix_parts.append(rise_dt.timestamp() + offsets)
+            pass_bounds.append((first, first + len(offsets)))
+            first += len(offsets)
+
+        sample_times = ts.tt_jd(np.concatenate(whole_parts), np.concatenate(fraction_parts))
+        samples_posix = np.concatenate(posix_parts)
 
         topocentric = (satellite - observer).at(sample_times)
         iss_alt, iss_az, _ = topocentric.altaz()
+        iss_sunlit = np.asarray(satellite.at(sample_times).is_sunlit(eph), dtype=bool)
+
+        iss_alt_deg = iss_alt.degrees
+        iss_az_deg = iss_az.degrees
+
+        # Evaluating the Sun on the same grid reuses the Earth-orientation values that
+        # Skyfield has already cached on `sample_times` for the ISS positions.
         sun_alt, _, _ = (earth + observer).at(sample_times).observe(sun).apparent().altaz()
-        iss_sunlit = satellite.at(sample_times).is_sunlit(eph)
-
-        return self._windows_from_samples(
-            loc=loc,
-            sample_times_utc=samples_utc,
-            iss_alt_deg=[float(v) for v in iss_alt.degrees],
-            iss_az_deg=[float(v) for v in iss_az.degrees],
-            sun_alt_deg=[float(v) for v in sun_alt.degrees],
-            iss_sunlit=[bool(v) for v in iss_sunlit],
+        sun_alt_deg = sun_alt.degrees
+
+        batch = SampleBatch(
+            seconds=samples_posix,
+            alt=iss_alt_deg,
+            az=iss_az_deg,
+            sun_alt=sun_alt_deg,
+            sunlit=iss_sunlit,
         )
+        windows: list[VisibilityWindow] = []
+        for first, last in pass_bounds:
+            windows.extend(self._windows_from_batch(loc, batch.rows(first, last)))
+        return windows
 
     def _windows_from_samples(
         self,
         *,
         loc: Location,
-        sample_times_utc: Sequence[datetime],
-        iss_alt_deg: Sequence[float],
-        iss_az_deg: Sequence[float],
-        sun_alt_deg: Sequence[float],
-        iss_sunlit: Sequence[bool],
+        sample_times_utc: Sequence[datetime] | FloatArray,
+        iss_alt_deg: Sequence[float] | FloatArray,
+        iss_az_deg: Sequence[float] | FloatArray,
+        sun_alt_deg: Sequence[float] | FloatArray,
+        iss_sunlit: Sequence[bool] | BoolArray,
     ) -> list[VisibilityWindow]:
-        """Construct visibility windows from sampled pass arrays."""
+        """Construct visibility windows from sampled pass arrays.
+
+        Sample values may be NumPy arrays (as produced by Skyfield) or plain sequences.
+        Sample times are either aware datetimes or an array of POSIX seconds.
+        """
+
+        batch = SampleBatch.from_samples(
+            sample_times_utc=sample_times_utc,
+            iss_alt_deg=iss_alt_deg,
+            iss_az_deg=iss_az_deg,
+            sun_alt_deg=sun_alt_deg,
+            iss_sunlit=iss_sunlit,
+        )
+        return self._windows_from_batch(loc, batch)
 
-        n = len(sample_times_utc)
-        if not (n == len(iss_alt_deg) == len(iss_az_deg) == len(sun_alt_deg) == len(iss_sunlit)):
-            raise PredictionError("Sample arrays must have the same length")
-        if n == 0:
-            return []
+    def _windows_from_batch(self, loc: Location, batch: SampleBatch) -> list[VisibilityWindow]:
+        """Construct visibility windows from one pass worth of samples."""
 
-        mask = [
-            (iss_alt_deg[i] >= self.config.min_elev_deg)
-            and (sun_alt_deg[i] <= self.config.twilight_deg)
-            and iss_sunlit[i]
-            for i in range(n)
-        ]
+        # Cheap whole-pass rejections: a pass that is never sunlit, or never under a
+        # dark enough sky, cannot contain a visible span.
+        if not batch.sunlit.any() or not (batch.sun_alt <= self.config.twilight_deg).any():
+            return []
+        seconds = batch.seconds
+        iss_alt = batch.alt
+        iss_az = batch.az
 
-        windows: list[VisibilityWindow] = []
-        for start_idx, end_idx in contiguous_true_spans(mask):
-            start_utc = sample_times_utc[start_idx]
-            end_utc = sample_times_utc[end_idx]
-            duration = end_utc - start_utc
-            if duration.total_seconds() < self.config.min_window_seconds:
-                continue
+        spans = scan_spans(
+            iss_alt, batch.sun_alt, batch.sunlit, self.config.min_elev_deg, self.config.twilight_deg
+        )
+        # Round to datetime's microsecond resolution so float error in the POSIX seconds
+        # cannot push an exact-length span across the duration thresholds.
+        durations = np.round(seconds[spans[:, 2]] - seconds[spans[:, 0]], 6)
+        long_enough = durations >= self.config.min_window_seconds
+        kept = spans[long_enough]
+        durations = durations[long_enough]
+        if len(kept) == 0:
+            return []
+        peaks = kept[:, 1]
 
-            span_indices = range(start_idx, end_idx + 1)
-            peak_idx = max(span_indices, key=lambda idx: iss_alt_deg[idx])
+        # One lookup for the start/peak/end directions and one for the stars of every span.
+        directions = az_to_cardinal_array(iss_az[kept]).tolist()
+        stars = visibility_stars_batch(iss_alt[peaks], durations).tolist()
 
-            start_local = start_utc.astimezone(loc.timezone)
-            end_local = end_utc.astimezone(loc.timezone)
-            peak_local = sample_times_utc[peak_idx].astimezone(loc.timezone)
+        # Pull every per-window column out of NumPy once; the loop below only indexes
+        # plain Python lists and converts timestamps straight into the local zone.
+        tz = loc.timezone
+        times = seconds[kept].tolist()
+        azimuths = iss_az[kept].tolist()
+        peak_elevations = iss_alt[peaks].tolist()
 
-            start_az = iss_az_deg[start_idx]
-            peak_az = iss_az_deg[peak_idx]
-            end_az = iss_az_deg[end_idx]
+        windows: list[VisibilityWindow] = []
+        columns = zip(
+            times, azimuths, directions, peak_elevations, durations.tolist(), stars, strict=True
+        )
+        for win_times, win_azimuths, win_dirs, peak_elevation, duration_s, score in columns:
+            start_s, peak_s, end_s = win_times
+            start_az, peak_az, end_az = win_azimuths
+            start_dir, peak_dir, end_dir = win_dirs
 
+            # Times are tz-aware, spans are ordered and stars are clamped.
             windows.append(
-                VisibilityWindow(
-                    start_local=start_local,
-                    end_local=end_local,
-                    peak_local=peak_local,
-                    duration=duration,
-                    peak_elevation_deg=iss_alt_deg[peak_idx],
+                VisibilityWindow.unchecked(
+                    start_local=datetime.fromtimestamp(start_s, tz),
+                    end_local=datetime.fromtimestamp(end_s, tz),
+                    peak_local=datetime.fromtimestamp(peak_s, tz),
+                    duration=timedelta(seconds=duration_s),
+                    peak_elevation_deg=peak_elevation,
                     start_azimuth_deg=start_az,
                     peak_azimuth_deg=peak_az,
                     end_azimuth_deg=end_az,
-                    start_direction=az_to_cardinal(start_az),
-                    peak_direction=az_to_cardinal(peak_az),
-                    end_direction=az_to_cardinal(end_az),
-                    visibility_stars=self._visibility_stars(
-                        peak_elevation_deg=iss_alt_deg[peak_idx],
-                        duration_seconds=duration.total_seconds(),
-                    ),
+                    start_direction=start_dir,
+                    peak_direction=peak_dir,
+                    end_direction=end_dir,
+                    visibility_stars=score,
                 )
             )
 
@@ -214,20 +373,3 @@ class ISSPredictor:
         if dt_value.tzinfo is None:
             return dt_value.replace(tzinfo=UTC)
         return dt_value.astimezone(UTC)
-
-    @staticmethod
-    def _visibility_stars(peak_elevation_deg: float, duration_seconds: float) -> int:
-        """Compute a qualitative 1..5 visibility score from peak elevation and duration."""
-
-        score = 1
-
-        if peak_elevation_deg >= 20:
-            score += 1
-        if peak_elevation_deg >= 40:
-            score += 1
-        if peak_elevation_deg >= 65:
-            score += 1
-        if duration_seconds >= 120:
-            score += 1
-
-        return max(1, min(score, 5))
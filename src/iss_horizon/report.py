@@ -2,27 +2,99 @@
 
 from __future__ import annotations
 
-from collections import defaultdict
-from datetime import datetime
+import io
+from datetime import date, datetime
 from html import escape
+from itertools import groupby
 from zoneinfo import ZoneInfo
 
 from iss_horizon.models import Location, MonthRange, VisibilityWindow
 
-from .utils import format_duration
-
-
-def _stars_text(stars: int) -> str:
-    if not 1 <= stars <= 5:
-        raise ValueError("stars must be in 1..5")
-    return "★" * stars + "☆" * (5 - stars)
-
-
-def _group_windows_by_day(windows: list[VisibilityWindow]) -> dict[str, list[VisibilityWindow]]:
-    by_day: dict[str, list[VisibilityWindow]] = defaultdict(list)
-    for window in sorted(windows, key=lambda item: item.start_local):
-        by_day[window.start_local.date().isoformat()].append(window)
-    return by_day
+from .utils import format_duration, stars_text
+
+_BODY_STYLE = (
+    "body{font-family:Arial,sans-serif;color:#1f2937;margin:0;padding:24px;background:#f8fafc;}"
+)
+_MAIN_EMPTY_STYLE = (
+    "main{max-width:920px;margin:0 auto;background:#ffffff;padding:20px;border:1px solid #e5e7eb;}"
+)
+_MAIN_STYLE = (
+    "main{max-width:980px;margin:0 auto;background:#ffffff;padding:20px;border:1px solid #e5e7eb;}"
+)
+_COMMON_STYLE = (
+    "h1{font-size:20px;margin:0;}"
+    "p{margin:4px 0 0;}"
+    ".hero{background:#0f172a;color:#f8fafc;padding:16px;border-radius:8px;}"
+    ".hero-meta{font-size:13px;color:#cbd5e1;margin-top:8px;}"
+    ".pill{display:inline-block;background:#e2e8f0;color:#1e293b;padding:4px 8px;"
+    "border-radius:999px;font-size:12px;margin-right:8px;margin-top:10px;}"
+    ".day-title{font-size:16px;margin:0 0 8px;color:#111827;}"
+    "table{width:100%;border-collapse:collapse;font-size:13px;}"
+    "thead tr{background:#f3f4f6;text-align:left;}"
+    "th{padding:8px;border:1px solid #e5e7eb;color:#374151;}"
+    "td{padding:8px;border:1px solid #e5e7eb;vertical-align:top;}"
+    ".stars{font-weight:700;color:#b45309;}"
+    ".footer{font-size:12px;color:#6b7280;margin-top:16px;}"
+)
+
+# Document prefix up to the opening hero header. The stylesheet contains braces, so the
+# prefixes are plain strings that callers append to rather than str.format templates.
+_HTML_HEAD_EMPTY = (
+    "<!doctype html><html><head><meta charset='utf-8'>"
+    f"<style>{_BODY_STYLE}{_MAIN_EMPTY_STYLE}{_COMMON_STYLE}</style>"
+    "</head><body><main><header class='hero'>"
+)
+_HTML_HEAD_FULL = (
+    "<!doctype html><html><head><meta charset='utf-8'>"
+    f"<style>{_BODY_STYLE}{_MAIN_STYLE}{_COMMON_STYLE}</style>"
+    "</head><body><main><header class='hero'>"
+)
+_HTML_SECTION_OPEN = (
+    "<section style='margin-top:18px;'>"
+    "<h2 class='day-title'>{day}</h2>"
+    "<table>"
+    "<thead><tr>"
+    "<th>Window</th>"
+    "<th>Duration</th>"
+    "<th>Visibility</th>"
+    "<th>Start az/dir</th>"
+    "<th>Peak</th>"
+    "<th>End az/dir</th>"
+    "</tr></thead>"
+    "<tbody>"
+)
+_HTML_ROW = (
+    "<tr>"
+    "<td>{start} → {end}</td>"
+    "<td>{duration}</td>"
+    "<td><span class='stars'>{stars}</span></td>"
+    "<td>{start_az:.1f}° {start_dir}</td>"
+    "<td>{peak_elev:.1f}° @ {peak_az:.1f}° {peak_dir} at {peak_time}</td>"
+    "<td>{end_az:.1f}° {end_dir}</td>"
+    "</tr>"
+)
+_TEXT_ROW = (
+    "  {start} -> {end} ({duration}) | "
+    "visibility {stars} | "
+    "start {start_az:.1f}° {start_dir} | "
+    "peak {peak_elev:.1f}° @ {peak_az:.1f}° {peak_dir} at {peak_time} | "
+    "end {end_az:.1f}° {end_dir}\n"
+)
+_GENERATED_FORMAT = "%Y-%m-%d %H:%M:%S %Z"
+
+
+def _clock_label(value: datetime) -> str:
+    return f"{value.hour:02d}:{value.minute:02d}:{value.second:02d}"
+
+
+def _group_windows_by_day(
+    windows: list[VisibilityWindow],
+) -> list[tuple[str, list[VisibilityWindow]]]:
+    ordered = sorted(windows, key=lambda item: item.start_local)
+    return [
+        (date.fromordinal(ordinal).isoformat(), list(day_windows))
+        for ordinal, day_windows in groupby(ordered, key=lambda item: item.start_local.toordinal())
+    ]
 
 
 def _generated_label(loc: Location, generated_at: datetime | None = None) -> str:
@@ -31,7 +103,7 @@ def _generated_label(loc: Location, generated_at: datetime | None = None) -> str
         timestamp = timestamp.replace(tzinfo=loc.timezone)
     else:
         timestamp = timestamp.astimezone(loc.timezone)
-    return timestamp.strftime("%Y-%m-%d %H:%M:%S %Z")
+    return timestamp.strftime(_GENERATED_FORMAT)
 
 
 def _settings_label(
@@ -110,28 +182,31 @@ def format_monthly_report(
 
     by_day = _group_windows_by_day(windows)
 
-    lines = header
-    for day in sorted(by_day):
-        lines.append(day)
-        for item in by_day[day]:
-            start = item.start_local.strftime("%H:%M:%S")
-            end = item.end_local.strftime("%H:%M:%S")
-            peak_time = item.peak_local.strftime("%H:%M:%S")
-            duration = format_duration(item.duration)
-            lines.append(
-                "  "
-                f"{start} -> {end} ({duration}) | "
-                f"visibility {_stars_text(item.visibility_stars)} | "
-                f"start {item.start_azimuth_deg:.1f}° {item.start_direction} | "
-                "peak "
-                f"{item.peak_elevation_deg:.1f}° @ {item.peak_azimuth_deg:.1f}° "
-                f"{item.peak_direction} "
-                f"at {peak_time} | "
-                f"end {item.end_azimuth_deg:.1f}° {item.end_direction}"
+    buf = io.StringIO()
+    buf.write("\n".join(header))
+    buf.write("\n")
+    for day, day_windows in by_day:
+        buf.write(f"{day}\n")
+        for item in day_windows:
+            buf.write(
+                _TEXT_ROW.format(
+                    start=_clock_label(item.start_local),
+                    end=_clock_label(item.end_local),
+                    duration=format_duration(item.duration),
+                    stars=stars_text(item.visibility_stars),
+                    start_az=item.start_azimuth_deg,
+                    start_dir=item.start_direction,
+                    peak_elev=item.peak_elevation_deg,
+                    peak_az=item.peak_azimuth_deg,
+                    peak_dir=item.peak_direction,
+                    peak_time=_clock_label(item.peak_local),
+                    end_az=item.end_azimuth_deg,
+                    end_dir=item.end_direction,
+                )
             )
-        lines.append("")
+        buf.write("\n")
 
-    return "\n".join(lines).rstrip() + "\n"
+    return buf.getvalue().rstrip() + "\n"
 
 
 def format_monthly_report_html(
@@ -161,44 +236,9 @@ def format_monthly_report_html(
     )
     escaped_settings = escape(settings) if settings else None
     escaped_project_url = escape(project_url) if project_url else None
-    body_style = (
-        "body{font-family:Arial,sans-serif;color:#1f2937;margin:0;padding:24px;background:#f8fafc;}"
-    )
-    main_empty_style = (
-        "main{max-width:920px;margin:0 auto;background:#ffffff;"
-        "padding:20px;border:1px solid #e5e7eb;}"
-    )
-    main_style = (
-        "main{max-width:980px;margin:0 auto;background:#ffffff;"
-        "padding:20px;border:1px solid #e5e7eb;}"
-    )
-    common_style = (
-        "h1{font-size:20px;margin:0;}"
-        "p{margin:4px 0 0;}"
-        ".hero{background:#0f172a;color:#f8fafc;padding:16px;border-radius:8px;}"
-        ".hero-meta{font-size:13px;color:#cbd5e1;margin-top:8px;}"
-        ".pill{display:inline-block;background:#e2e8f0;color:#1e293b;padding:4px 8px;"
-        "border-radius:999px;font-size:12px;margin-right:8px;margin-top:10px;}"
-        ".day-title{font-size:16px;margin:0 0 8px;color:#111827;}"
-        "table{width:100%;border-collapse:collapse;font-size:13px;}"
-        "thead tr{background:#f3f4f6;text-align:left;}"
-        "th{padding:8px;border:1px solid #e5e7eb;color:#374151;}"
-        "td{padding:8px;border:1px solid #e5e7eb;vertical-align:top;}"
-        ".stars{font-weight:700;color:#b45309;}"
-        ".footer{font-size:12px;color:#6b7280;margin-top:16px;}"
-    )
-
     if not windows:
         return (
-            "<!doctype html>"
-            "<html><head><meta charset='utf-8'>"
-            "<style>"
-            f"{body_style}"
-            f"{main_empty_style}"
-            f"{common_style}"
-            "</style></head><body><main>"
-            "<header class='hero'>"
-            f"<h1>{escaped_title}</h1>"
+            _HTML_HEAD_EMPTY + f"<h1>{escaped_title}</h1>"
             "<div class='hero-meta'>"
             f"Month: {escaped_month} · Timezone: {escaped_tz} · Generated: {generated_label}"
             "</div></header>"
@@ -216,70 +256,44 @@ def format_monthly_report_html(
         )
 
     by_day = _group_windows_by_day(windows)
-    sections: list[str] = []
-    total_windows = sum(len(day_windows) for day_windows in by_day.values())
-
-    for day in sorted(by_day):
-        rows: list[str] = []
-        for item in by_day[day]:
-            start = item.start_local.strftime("%H:%M:%S")
-            end = item.end_local.strftime("%H:%M:%S")
-            peak_time = item.peak_local.strftime("%H:%M:%S")
-            duration = format_duration(item.duration)
-            rows.append(
-                "<tr>"
-                f"<td>{escape(start)} → {escape(end)}</td>"
-                f"<td>{escape(duration)}</td>"
-                f"<td><span class='stars'>{escape(_stars_text(item.visibility_stars))}</span></td>"
-                f"<td>{item.start_azimuth_deg:.1f}° {escape(item.start_direction)}</td>"
-                "<td>"
-                f"{item.peak_elevation_deg:.1f}° @ {item.peak_azimuth_deg:.1f}° "
-                f"{escape(item.peak_direction)} at {escape(peak_time)}"
-                "</td>"
-                f"<td>{item.end_azimuth_deg:.1f}° {escape(item.end_direction)}</td>"
-                "</tr>"
+    parts = [
+        _HTML_HEAD_FULL,
+        f"<h1>{escaped_title}</h1><div class='hero-meta'>"
+        f"Month: {escaped_month} · Timezone: {escaped_tz} · Generated: {generated_label}</div>"
+        f"<span class='pill'>{len(windows)} windows</span>"
+        f"<span class='pill'>{len(by_day)} days</span></header>",
+    ]
+    append = parts.append
+    for day, day_windows in by_day:
+        append(_HTML_SECTION_OPEN.format(day=escape(day)))
+        for item in day_windows:
+            # Clock labels, durations and star glyphs never contain markup characters.
+            append(
+                _HTML_ROW.format(
+                    start=_clock_label(item.start_local),
+                    end=_clock_label(item.end_local),
+                    duration=format_duration(item.duration),
+                    stars=stars_text(item.visibility_stars),
+                    start_az=item.start_azimuth_deg,
+                    start_dir=escape(item.start_direction),
+                    peak_elev=item.peak_elevation_deg,
+                    peak_az=item.peak_azimuth_deg,
+                    peak_dir=escape(item.peak_direction),
+                    peak_time=_clock_label(item.peak_local),
+                    end_az=item.end_azimuth_deg,
+                    end_dir=escape(item.end_direction),
+                )
             )
+        append("</tbody></table></section>")
 
-        sections.append(
-            "<section style='margin-top:18px;'>"
-            f"<h2 class='day-title'>{escape(day)}</h2>"
-            "<table>"
-            "<thead><tr>"
-            "<th>Window</th>"
-            "<th>Duration</th>"
-            "<th>Visibility</th>"
-            "<th>Start az/dir</th>"
-            "<th>Peak</th>"
-            "<th>End az/dir</th>"
-            "</tr></thead>"
-            f"<tbody>{''.join(rows)}</tbody></table></section>"
-        )
-
-    return (
-        "<!doctype html>"
-        "<html><head><meta charset='utf-8'>"
-        "<style>"
-        f"{body_style}"
-        f"{main_style}"
-        f"{common_style}"
-        "</style></head><body><main>"
-        "<header class='hero'>"
-        f"<h1>{escaped_title}</h1>"
-        "<div class='hero-meta'>"
-        f"Month: {escaped_month} · Timezone: {escaped_tz} · Generated: {generated_label}"
-        "</div>"
-        f"<span class='pill'>{total_windows} windows</span>"
-        f"<span class='pill'>{len(by_day)} days</span>"
-        "</header>"
-        + "".join(sections)
-        + (f"<p class='footer'>Settings: {escaped_settings}</p>" if escaped_settings else "")
-        + (
+    if escaped_settings:
+        append(f"<p class='footer'>Settings: {escaped_settings}</p>")
+    if escaped_project_url:
+        append(
             "<p class='footer'>"
             f"Project: <a href='{escaped_project_url}'>{escaped_project_url}</a>"
             "</p>"
-            if escaped_project_url
-            else ""
         )
-        + f"<p class='footer'>Generated by ISS-Horizon at {generated_label}</p>"
-        + "</main></body></html>"
-    )
+    append(f"<p class='footer'>Generated by ISS-Horizon at {generated_label}</p>")
+    append("</main></body></html>")
+    return "".join(parts)
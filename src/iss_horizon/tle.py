@@ -1,14 +1,28 @@
-"""TLE retrieval with simple in-memory caching."""
+"""TLE retrieval with in-memory and on-disk caching."""
 
 from __future__ import annotations
 
+import contextlib
+import hashlib
+import os
+import time
+from collections.abc import Iterable
+from email.utils import formatdate
+from pathlib import Path
 from typing import Final
 
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 
+from iss_horizon.config import cache_dir
 from iss_horizon.models import TLE, TLEFetchError
 
-_TLE_CACHE: dict[tuple[str, str], TLE] = {}
+from .utils import atomic_write_text
+
+# Values are (tle, time.monotonic() expiry); the disk cache shares the same TTL.
+_TLE_CACHE: dict[tuple[str, str], tuple[TLE, float]] = {}
+_CACHE_TTL_SECONDS: Final[float] = 6 * 3600.0
 _DEFAULT_TIMEOUT: Final[float] = 15.0
 _DEFAULT_HEADERS: Final[dict[str, str]] = {
     "User-Agent": "ISS-Horizon/0.1 (+https://github.com/natalnetwork/ISS-Horizon)",
@@ -18,6 +32,26 @@ _FALLBACK_STATIONS_URL: Final[str] = "https://celestrak.org/NORAD/elements/stati
 _FALLBACK_GP_URL: Final[str] = (
     "https://celestrak.org/NORAD/elements/gp.php?GROUP=stations&FORMAT=tle"
 )
+_RETRY_STATUSES: Final[tuple[int, ...]] = (429, 500, 502, 503, 504)
+
+
+def _build_session() -> requests.Session:
+    """Return a keep-alive session that retries transient CelesTrak failures."""
+
+    session = requests.Session()
+    retry = Retry(
+        total=2,
+        backoff_factor=0.3,
+        status_forcelist=_RETRY_STATUSES,
+        allowed_methods=frozenset({"GET"}),
+        raise_on_status=False,
+    )
+    session.mount("https://", HTTPAdapter(max_retries=retry))
+    return session
+
+
+# Shared so the primary URL and the 403 fallback reuse one TLS connection.
+_SESSION: Final[requests.Session] = _build_session()
 _BUNDLED_ISS_TLE: Final[TLE] = TLE(
     name="ISS (ZARYA)",
     line1="1 25544U 98067A   26051.50000000  .00010000  00000+0  18277-3 0  9991",
@@ -25,26 +59,81 @@ _BUNDLED_ISS_TLE: Final[TLE] = TLE(
 )
 
 
-def _fetch_text(url: str) -> str:
-    response = requests.get(url, timeout=_DEFAULT_TIMEOUT, headers=_DEFAULT_HEADERS)
-    response.raise_for_status()
-    return response.text
+def _fetch_tle(name: str, url: str, *, if_modified_since: float | None = None) -> TLE | None:
+    """Stream `url` and return the first TLE named `name`, or None on 304 Not Modified.
 
+    The response is parsed line by line, so the download stops as soon as the
+    requested satellite has been read.
+    """
 
-def _parse_tle(name: str, text: str, source_url: str) -> TLE:
-    lines = [line.strip() for line in text.splitlines() if line.strip()]
-    target = name.strip().lower()
+    headers = _DEFAULT_HEADERS
+    if if_modified_since is not None:
+        headers = {**headers, "If-Modified-Since": formatdate(if_modified_since, usegmt=True)}
+    response = _SESSION.get(url, timeout=_DEFAULT_TIMEOUT, headers=headers, stream=True)
+    try:
+        if response.status_code == 304:
+            return None
+        response.raise_for_status()
+        return _parse_tle_lines(name, response.iter_lines(decode_unicode=True), url)
+    finally:
+        response.close()
+
+
+def _disk_cache_path(name: str, url: str) -> Path:
+    digest = hashlib.sha256(f"{name}\n{url}".encode()).hexdigest()[:32]
+    return cache_dir() / "tle" / f"{digest}.tle"
+
+
+def _read_disk_cache(name: str, path: Path) -> tuple[TLE, float] | None:
+    """Return the cached TLE and its file mtime; missing or unreadable files count as absent."""
+
+    try:
+        text = path.read_text(encoding="utf-8")
+        mtime = path.stat().st_mtime
+        return _parse_tle(name, text, str(path)), mtime
+    except (OSError, TLEFetchError):
+        return None
+
+
+def _write_disk_cache(path: Path, tle: TLE) -> None:
+    # The disk cache is best-effort; the TLE has already been fetched.
+    with contextlib.suppress(OSError):
+        atomic_write_text(path, f"{tle.name}\n{tle.line1}\n{tle.line2}\n")
+
+
+def _remember(cache_key: tuple[str, str], tle: TLE, ttl: float = _CACHE_TTL_SECONDS) -> None:
+    _TLE_CACHE[cache_key] = (tle, time.monotonic() + ttl)
+
+
+def _fallback_tle(name: str, stale: tuple[TLE, float] | None) -> TLE | None:
+    """Prefer an expired disk-cache entry over the bundled TLE when the network fails."""
 
-    for index in range(0, len(lines) - 2):
-        sat_name = lines[index]
-        line1 = lines[index + 1]
-        line2 = lines[index + 2]
-        if sat_name.lower() == target and line1.startswith("1 ") and line2.startswith("2 "):
+    if stale is not None:
+        return stale[0]
+    return _bundled_tle(name)
+
+
+def _parse_tle_lines(name: str, lines: Iterable[str | bytes], source_url: str) -> TLE:
+    target = name.strip().lower()
+    sat_name = line1 = ""
+
+    for raw_line in lines:
+        text = raw_line.decode("utf-8", "replace") if isinstance(raw_line, bytes) else raw_line
+        line2 = text.strip()
+        if not line2:
+            continue
+        # Only one line in three starts with "2 ", so test that first.
+        if line2.startswith("2 ") and line1.startswith("1 ") and sat_name.lower() == target:
             return TLE(name=sat_name, line1=line1, line2=line2)
+        sat_name, line1 = line1, line2
 
     raise TLEFetchError(f"TLE '{name}' not found in {source_url}")
 
 
+def _parse_tle(name: str, text: str, source_url: str) -> TLE:
+    return _parse_tle_lines(name, text.splitlines(), source_url)
+
+
 def _bundled_tle(name: str) -> TLE | None:
     if name.strip().lower() == _BUNDLED_ISS_TLE.name.lower():
         return _BUNDLED_ISS_TLE
@@ -52,41 +141,67 @@ def _bundled_tle(name: str) -> TLE | None:
 
 
 def fetch_tle(name: str, url: str) -> TLE:
-    """Fetch a satellite TLE by name from a CelesTrak-style text file."""
+    """Fetch a satellite TLE by name from a CelesTrak-style text file.
+
+    TLEs are cached in memory and on disk for six hours. After that the cached copy is
+    revalidated with ``If-Modified-Since`` and is used ahead of the bundled ISS TLE when
+    offline.
+    """
 
     cache_key = (name, url)
-    if cache_key in _TLE_CACHE:
-        return _TLE_CACHE[cache_key]
+    remembered = _TLE_CACHE.get(cache_key)
+    if remembered is not None and time.monotonic() < remembered[1]:
+        return remembered[0]
+
+    path = _disk_cache_path(name, url)
+    cached = _read_disk_cache(name, path)
+    if cached is not None:
+        age = time.time() - cached[1]
+        if age < _CACHE_TTL_SECONDS:
+            _remember(cache_key, cached[0], ttl=_CACHE_TTL_SECONDS - age)
+            return cached[0]
 
     try:
-        text = _fetch_text(url)
-        tle = _parse_tle(name, text, url)
-        _TLE_CACHE[cache_key] = tle
+        fetched = _fetch_tle(name, url, if_modified_since=cached[1] if cached else None)
+        if fetched is None:
+            if cached is None:
+                raise TLEFetchError(f"Unexpected 304 Not Modified from {url}")
+            # Not modified since the cached copy was written; restart its TTL.
+            with contextlib.suppress(OSError):
+                os.utime(path)
+            tle = cached[0]
+        else:
+            tle = fetched
+            _write_disk_cache(path, tle)
+        _remember(cache_key, tle)
         return tle
     except requests.HTTPError as exc:
         status_code = exc.response.status_code if exc.response is not None else None
         if status_code == 403 and url == _FALLBACK_STATIONS_URL:
             try:
-                text = _fetch_text(_FALLBACK_GP_URL)
-                tle = _parse_tle(name, text, _FALLBACK_GP_URL)
-                _TLE_CACHE[cache_key] = tle
+                fetched = _fetch_tle(name, _FALLBACK_GP_URL)
+                if fetched is None:
+                    raise TLEFetchError(f"Unexpected 304 Not Modified from {_FALLBACK_GP_URL}")
+                tle = fetched
+                _write_disk_cache(path, tle)
+                _remember(cache_key, tle)
                 return tle
             except requests.RequestException as fallback_exc:
-                bundled = _bundled_tle(name)
-                if bundled is not None:
-                    _TLE_CACHE[cache_key] = bundled
-                    return bundled
+                fallback = _fallback_tle(name, cached)
+                if fallback is not None:
+                    _remember(cache_key, fallback)
+                    return fallback
                 raise TLEFetchError(
                     f"Failed to fetch TLE from {_FALLBACK_GP_URL}: {fallback_exc}"
                 ) from fallback_exc
-        bundled = _bundled_tle(name)
-        if bundled is not None:
-            _TLE_CACHE[cache_key] = bundled
-            return bundled
+        fallback = _fallback_tle(name, cached)
+        if fallback is not None:
+            _remember(cache_key, fallback)
+            return fallback
         raise TLEFetchError(f"Failed to fetch TLE from {url}: {exc}") from exc
     except requests.RequestException as exc:
-        bundled = _bundled_tle(name)
-        if bundled is not None:
-            _TLE_CACHE[cache_key] = bundled
-            return bundled
+        fallback = _fallback_tle(name, cached)
+        if fallback is not None:
+            _remember(cache_key, fallback)
+            return fallback
         raise TLEFetchError(f"Failed to fetch TLE from {url}: {exc}") from exc
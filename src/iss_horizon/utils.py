@@ -1,9 +1,48 @@
-"""Utility functions for direction mapping and boolean span extraction."""
+"""Utility functions for direction mapping, visibility span scanning and file caching."""
 
 from __future__ import annotations
 
-from collections.abc import Sequence
+import bisect
+import contextlib
+import functools
+import os
+import tempfile
+from collections.abc import Callable
 from datetime import timedelta
+from pathlib import Path
+
+import numpy as np
+import numpy.typing as npt
+
+_STAR_ELEVATION_THRESHOLDS = (20.0, 40.0, 65.0)
+_STAR_DURATION_SECONDS = 120.0
+_STAR_STRINGS = tuple("★" * count + "☆" * (5 - count) for count in range(6))
+
+_CARDINAL_LABELS: dict[int, tuple[str, ...]] = {
+    4: ("N", "E", "S", "W"),
+    8: ("N", "NE", "E", "SE", "S", "SW", "W", "NW"),
+    16: (
+        "N",
+        "NNE",
+        "NE",
+        "ENE",
+        "E",
+        "ESE",
+        "SE",
+        "SSE",
+        "S",
+        "SSW",
+        "SW",
+        "WSW",
+        "W",
+        "WNW",
+        "NW",
+        "NNW",
+    ),
+}
+_CARDINAL_LOOKUP: dict[int, npt.NDArray[np.str_]] = {
+    points: np.array(labels) for points, labels in _CARDINAL_LABELS.items()
+}
 
 
 def az_to_cardinal(az_deg: float, points: int = 16) -> str:
@@ -20,29 +59,7 @@ def az_to_cardinal(az_deg: float, points: int = 16) -> str:
         ValueError: If `points` is unsupported.
     """
 
-    labels_map = {
-        4: ["N", "E", "S", "W"],
-        8: ["N", "NE", "E", "SE", "S", "SW", "W", "NW"],
-        16: [
-            "N",
-            "NNE",
-            "NE",
-            "ENE",
-            "E",
-            "ESE",
-            "SE",
-            "SSE",
-            "S",
-            "SSW",
-            "SW",
-            "WSW",
-            "W",
-            "WNW",
-            "NW",
-            "NNW",
-        ],
-    }
-    labels = labels_map.get(points)
+    labels = _CARDINAL_LABELS.get(points)
     if labels is None:
         raise ValueError("points must be one of: 4, 8, 16")
 
@@ -52,27 +69,123 @@ def az_to_cardinal(az_deg: float, points: int = 16) -> str:
     return labels[index]
 
 
-def contiguous_true_spans(mask: Sequence[bool]) -> list[tuple[int, int]]:
+def az_to_cardinal_array(az_deg: npt.ArrayLike, points: int = 16) -> npt.NDArray[np.str_]:
+    """Vectorized `az_to_cardinal` returning an array of labels shaped like `az_deg`.
+
+    Raises:
+        ValueError: If `points` is unsupported.
+    """
+
+    lookup = _CARDINAL_LOOKUP.get(points)
+    if lookup is None:
+        raise ValueError("points must be one of: 4, 8, 16")
+
+    bucket_size = 360.0 / points
+    normalized = np.asarray(az_deg, dtype=np.float64) % 360.0
+    index = ((normalized + bucket_size / 2.0) // bucket_size).astype(np.intp) % points
+    return lookup[index]
+
+
+def contiguous_true_spans(mask: npt.ArrayLike) -> list[tuple[int, int]]:
     """Return inclusive index spans where mask values are contiguous True.
 
     Example:
         [False, True, True, False, True] -> [(1, 2), (4, 4)]
     """
 
-    spans: list[tuple[int, int]] = []
-    start: int | None = None
+    return [(start, end) for start, end in contiguous_true_spans_np(mask).tolist()]
+
+
+def contiguous_true_spans_np(mask: npt.ArrayLike) -> npt.NDArray[np.intp]:
+    """Vectorized `contiguous_true_spans` returning an (n, 2) array of inclusive spans.
 
-    for index, value in enumerate(mask):
-        if value and start is None:
-            start = index
-        elif not value and start is not None:
-            spans.append((start, index - 1))
-            start = None
+    Example:
+        [False, True, True, False, True] -> [[1, 2], [4, 4]]
+    """
 
-    if start is not None:
-        spans.append((start, len(mask) - 1))
+    values = np.asarray(mask, dtype=bool)
+    edges = np.diff(np.concatenate(([False], values, [False])).astype(np.int8))
+    starts = np.flatnonzero(edges == 1)
+    ends = np.flatnonzero(edges == -1) - 1
+    return np.stack([starts, ends], axis=1)
+
+
+def _scan_spans_kernel(
+    iss_alt: npt.NDArray[np.float64],
+    sun_alt: npt.NDArray[np.float64],
+    sunlit: npt.NDArray[np.bool_],
+    min_elev: float,
+    twilight: float,
+) -> npt.NDArray[np.intp]:
+    """Single-pass span scan; plain Python here, compiled by Numba when it is available."""
+
+    n = iss_alt.shape[0]
+    out = np.empty(((n + 1) // 2, 3), dtype=np.intp)
+    count = 0
+    start = -1
+    peak = -1
+    for i in range(n):
+        if iss_alt[i] >= min_elev and sun_alt[i] <= twilight and sunlit[i]:
+            if start < 0:
+                start = i
+                peak = i
+            elif iss_alt[i] > iss_alt[peak]:
+                peak = i
+        elif start >= 0:
+            out[count, 0] = start
+            out[count, 1] = peak
+            out[count, 2] = i - 1
+            count += 1
+            start = -1
+    if start >= 0:
+        out[count, 0] = start
+        out[count, 1] = peak
+        out[count, 2] = n - 1
+        count += 1
+    return out[:count]
+
+
+@functools.lru_cache(maxsize=1)
+def _compiled_scan_spans() -> Callable[..., npt.NDArray[np.intp]] | None:
+    """Return the Numba-compiled span kernel, or None without the optional dependency.
+
+    Numba is imported lazily because importing it costs far more than a month of
+    NumPy span scans for callers that never predict anything.
+    """
 
-    return spans
+    try:
+        import numba
+    except ImportError:
+        return None
+    compiled: Callable[..., npt.NDArray[np.intp]] = numba.njit(cache=True)(_scan_spans_kernel)
+    return compiled
+
+
+def scan_spans(
+    iss_alt: npt.ArrayLike,
+    sun_alt: npt.ArrayLike,
+    sunlit: npt.ArrayLike,
+    min_elev: float,
+    twilight: float,
+) -> npt.NDArray[np.intp]:
+    """Return an (n, 3) array of inclusive (start, peak, end) indices of visible spans.
+
+    A sample is visible when `iss_alt >= min_elev`, `sun_alt <= twilight` and `sunlit`.
+    The peak is the first sample with the highest `iss_alt` in its span. Uses a fused
+    Numba kernel when the ``speedups`` extra is installed and NumPy otherwise.
+    """
+
+    alt = np.ascontiguousarray(iss_alt, dtype=np.float64)
+    sun = np.ascontiguousarray(sun_alt, dtype=np.float64)
+    lit = np.ascontiguousarray(sunlit, dtype=np.bool_)
+
+    kernel = _compiled_scan_spans()
+    if kernel is not None:
+        return kernel(alt, sun, lit, float(min_elev), float(twilight))
+
+    spans = contiguous_true_spans_np((alt >= min_elev) & (sun <= twilight) & lit)
+    peaks = [start + int(alt[start : end + 1].argmax()) for start, end in spans.tolist()]
+    return np.column_stack((spans[:, 0], np.array(peaks, dtype=np.intp), spans[:, 1]))
 
 
 def format_duration(duration: timedelta) -> str:
@@ -93,19 +206,22 @@ def visibility_stars(peak_elevation_deg: float, duration_seconds: float) -> int:
     capped at 5 stars.
     """
 
-    score = 1
-
-    if peak_elevation_deg >= 20:
-        score += 1
-    if peak_elevation_deg >= 40:
-        score += 1
-    if peak_elevation_deg >= 65:
+    score = 1 + bisect.bisect_right(_STAR_ELEVATION_THRESHOLDS, peak_elevation_deg)
+    if duration_seconds >= _STAR_DURATION_SECONDS:
         score += 1
+    return min(score, 5)
 
-    if duration_seconds >= 120:
-        score += 1
 
-    return max(1, min(score, 5))
+def visibility_stars_batch(
+    peak_elevation_deg: npt.ArrayLike, duration_seconds: npt.ArrayLike
+) -> npt.NDArray[np.int8]:
+    """Vectorized ``visibility_stars`` for arrays of peak elevations and durations."""
+
+    score = 1 + np.searchsorted(
+        _STAR_ELEVATION_THRESHOLDS, np.asarray(peak_elevation_deg, dtype=np.float64), side="right"
+    )
+    score += np.asarray(duration_seconds, dtype=np.float64) >= _STAR_DURATION_SECONDS
+    return np.minimum(score, 5).astype(np.int8)
 
 
 def stars_text(stars: int) -> str:
@@ -113,4 +229,26 @@ def stars_text(stars: int) -> str:
 
     if not 1 <= stars <= 5:
         raise ValueError("stars must be in 1..5")
-    return "★" * stars + "☆" * (5 - stars)
+    return _STAR_STRINGS[stars]
+
+
+def atomic_write_text(path: Path, text: str) -> None:
+    """Write text to `path` via a temporary file and `os.replace`.
+
+    Readers never observe a partially written file. Missing parent directories
+    are created.
+
+    Raises:
+        OSError: If the directory or file cannot be written.
+    """
+
+    path.parent.mkdir(parents=True, exist_ok=True)
+    fd, tmp_name = tempfile.mkstemp(dir=path.parent, prefix=f".{path.name}.")
+    try:
+        with os.fdopen(fd, "w", encoding="utf-8") as handle:
+            handle.write(text)
+        os.replace(tmp_name, path)
+    except BaseException:
+        with contextlib.suppress(OSError):
+            os.unlink(tmp_name)
+        raise
@@ -0,0 +1,16 @@
+"""Shared pytest fixtures."""
+
+from __future__ import annotations
+
+from pathlib import Path
+
+import pytest
+
+
+@pytest.fixture(autouse=True)
+def _isolated_cache_dir(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> Path:
+    """Keep persistent caches out of the user's home directory during tests."""
+
+    cache = tmp_path / "cache"
+    monkeypatch.setenv("ISS_HORIZON_CACHE_DIR", str(cache))
+    return cache
@@ -0,0 +1,38 @@
+"""Unit tests for setup .env file handling."""
+
+from __future__ import annotations
+
+from pathlib import Path
+
+from iss_horizon.cli import _env_line, _parse_env_file
+
+
+def test_parse_env_file_reads_assignments(tmp_path: Path) -> None:
+    env_path = tmp_path / ".env"
+    env_path.write_text(
+        "# Generated by: iss-horizon setup\n"
+        "\n"
+        'ISS_LOCATION="Natal, RN, Brazil"\n'
+        "  SMTP_PORT = 465 \r\n"
+        "SMTP_TLS_MODE='ssl'\n"
+        "SMTP_USER=\n"
+        "# SMTP_HOST=ignored\n"
+        "not an assignment\n",
+        encoding="utf-8",
+    )
+
+    assert _parse_env_file(env_path) == {
+        "ISS_LOCATION": "Natal, RN, Brazil",
+        "SMTP_PORT": "465",
+        "SMTP_TLS_MODE": "ssl",
+        "SMTP_USER": "",
+    }
+
+
+def test_parse_env_file_missing_returns_empty(tmp_path: Path) -> None:
+    assert _parse_env_file(tmp_path / "missing.env") == {}
+
+
+def test_env_line_escapes_backslashes_and_quotes() -> None:
+    assert _env_line("SMTP_PASSWORD", 'a\\b"c') == 'SMTP_PASSWORD="a\\\\b\\"c"'
+    assert _env_line("ISS_LOCATION", "Natal, RN") == 'ISS_LOCATION="Natal, RN"'
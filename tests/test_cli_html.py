@@ -0,0 +1,115 @@
+"""Unit tests for HTML report file formatting."""
+
+from __future__ import annotations
+
+from datetime import datetime, timedelta
+from zoneinfo import ZoneInfo
+
+from iss_horizon.cli import _beautify_html
+from iss_horizon.models import Location, VisibilityWindow
+from iss_horizon.report import format_monthly_report_html
+
+
+def test_beautify_html_indents_nested_tags() -> None:
+    html = (
+        "<!doctype html><html><head><meta charset='utf-8'></head>"
+        "<body><p>Hello<br>world</p><table><tr><td>1</td></tr></table></body></html>"
+    )
+
+    assert _beautify_html(html) == (
+        "<!doctype html>\n"
+        "<html>\n"
+        "  <head>\n"
+        "    <meta charset='utf-8'>\n"
+        "  </head>\n"
+        "  <body>\n"
+        "    <p>Hello<br>world</p>\n"
+        "    <table>\n"
+        "      <tr>\n"
+        "        <td>1</td>\n"
+        "      </tr>\n"
+        "    </table>\n"
+        "  </body>\n"
+        "</html>\n"
+    )
+
+
+def test_beautify_html_formats_generated_report() -> None:
+    tz = ZoneInfo("America/Fortaleza")
+    loc = Location(
+        query="Natal",
+        resolved_name="Natal, RN, Brazil",
+        latitude=-5.79,
+        longitude=-35.2,
+        timezone_name="America/Fortaleza",
+        timezone=tz,
+    )
+    window = VisibilityWindow(
+        start_local=datetime(2026, 3, 2, 19, 0, 0, tzinfo=tz),
+        peak_local=datetime(2026, 3, 2, 19, 0, 30, tzinfo=tz),
+        end_local=datetime(2026, 3, 2, 19, 1, 0, tzinfo=tz),
+        duration=timedelta(minutes=1),
+        peak_elevation_deg=42.3,
+        start_azimuth_deg=250.1,
+        peak_azimuth_deg=270.5,
+        end_azimuth_deg=290.3,
+        start_direction="WSW",
+        peak_direction="W",
+        end_direction="WNW",
+    )
+    html = format_monthly_report_html(
+        loc, "2026-03", [window], generated_at=datetime(2026, 3, 1, 12, 0, tzinfo=tz)
+    )
+
+    lines = _beautify_html(html).split("\n")
+
+    assert lines[4].startswith("    <style>body{")
+    assert lines[4].endswith("</style>")
+    assert lines[:4] + lines[5:] == [
+        "<!doctype html>",
+        "<html>",
+        "  <head>",
+        "    <meta charset='utf-8'>",
+        "  </head>",
+        "  <body>",
+        "    <main>",
+        "      <header class='hero'>",
+        "        <h1>ISS visibility report for Natal, RN, Brazil</h1>",
+        "        <div class='hero-meta'>Month: 2026-03 · Timezone: America/Fortaleza · "
+        "Generated: 2026-03-01 12:00:00 -03</div>",
+        "        <span class='pill'>1 windows</span>",
+        "        <span class='pill'>1 days</span>",
+        "      </header>",
+        "      <section style='margin-top:18px;'>",
+        "        <h2 class='day-title'>2026-03-02</h2>",
+        "        <table>",
+        "          <thead>",
+        "            <tr>",
+        "              <th>Window</th>",
+        "              <th>Duration</th>",
+        "              <th>Visibility</th>",
+        "              <th>Start az/dir</th>",
+        "              <th>Peak</th>",
+        "              <th>End az/dir</th>",
+        "            </tr>",
+        "          </thead>",
+        "          <tbody>",
+        "            <tr>",
+        "              <td>19:00:00 → 19:01:00</td>",
+        "              <td>01:00</td>",
+        "              <td>",
+        "                <span class='stars'>★☆☆☆☆</span>",
+        "              </td>",
+        "              <td>250.1° WSW</td>",
+        "              <td>42.3° @ 270.5° W at 19:00:30</td>",
+        "              <td>290.3° WNW</td>",
+        "            </tr>",
+        "          </tbody>",
+        "        </table>",
+        "      </section>",
+        "      <p class='footer'>Generated by ISS-Horizon at 2026-03-01 12:00:00 -03</p>",
+        "    </main>",
+        "  </body>",
+        "</html>",
+        "",
+    ]
@@ -2,11 +2,22 @@
 
 from __future__ import annotations
 
+import threading
+from types import SimpleNamespace
+from typing import Any
 from unittest.mock import MagicMock, patch
 
 import requests
 
-from iss_horizon.cli import _detect_location_from_ip, _location_from_ip_payload
+from iss_horizon.cli import (
+    _detect_location_from_ip,
+    _ip_lookup_session,
+    _location_from_ip_payload,
+)
+
+
+def _json_response(payload: dict[str, Any]) -> SimpleNamespace:
+    return SimpleNamespace(raise_for_status=lambda: None, json=lambda: payload)
 
 
 def test_location_from_ip_payload_ipapi_style() -> None:
@@ -29,39 +40,72 @@ def test_location_from_ip_payload_requires_at_least_two_parts() -> None:
     assert _location_from_ip_payload(payload) is None
 
 
-@patch("iss_horizon.cli.requests.get")
+@patch("requests.Session.get")
 def test_detect_location_from_ip_first_provider_success(mock_get: MagicMock) -> None:
-    response = MagicMock()
-    response.raise_for_status.return_value = None
-    response.json.return_value = {
-        "city": "Recife",
-        "region": "Pernambuco",
-        "country_name": "Brazil",
-    }
-    mock_get.return_value = response
+    mock_get.return_value = _json_response(
+        {"city": "Recife", "region": "Pernambuco", "country_name": "Brazil"}
+    )
 
     assert _detect_location_from_ip() == "Recife, Pernambuco, Brazil"
 
 
-@patch("iss_horizon.cli.requests.get")
+@patch("requests.Session.get")
 def test_detect_location_from_ip_falls_back_to_second_provider(mock_get: MagicMock) -> None:
     first_error = requests.RequestException("primary provider unavailable")
 
-    second_response = MagicMock()
-    second_response.raise_for_status.return_value = None
-    second_response.json.return_value = {
-        "city": "Curitiba",
-        "region": "Parana",
-        "country": "Brazil",
-    }
+    second_response = _json_response({"city": "Curitiba", "region": "Parana", "country": "Brazil"})
 
     mock_get.side_effect = [first_error, second_response]
 
     assert _detect_location_from_ip() == "Curitiba, Parana, Brazil"
 
 
-@patch("iss_horizon.cli.requests.get")
+@patch("requests.Session.get")
 def test_detect_location_from_ip_returns_none_if_no_provider_works(mock_get: MagicMock) -> None:
     mock_get.side_effect = requests.RequestException("all providers unavailable")
 
     assert _detect_location_from_ip() is None
+
+
+@patch("requests.Session.get")
+def test_detect_location_from_ip_does_not_wait_for_slow_provider(mock_get: MagicMock) -> None:
+    release_slow_provider = threading.Event()
+
+    fast_response = _json_response({"city": "Natal", "region": "RN", "country": "Brazil"})
+
+    def fake_get(url: str, **_: Any) -> SimpleNamespace:
+        if "ipapi.co" in url:
+            release_slow_provider.wait(timeout=5)
+            raise requests.RequestException("too slow")
+        return fast_response
+
+    mock_get.side_effect = fake_get
+    try:
+        assert _detect_location_from_ip() == "Natal, RN, Brazil"
+    finally:
+        release_slow_provider.set()
+
+
+def test_ip_lookup_session_is_shared() -> None:
+    session = _ip_lookup_session()
+
+    assert _ip_lookup_session() is session
+    assert session.headers["User-Agent"] == "iss-horizon-setup/0.1"
+    assert session.get_adapter("https://ipwho.is/")._pool_maxsize == 8
+
+
+def test_location_from_ip_payload_ip2location_style() -> None:
+    payload = {
+        "city_name": "Oslo",
+        "region_name": "Oslo",
+        "country_name": "Norway",
+        "region": None,
+    }
+
+    assert _location_from_ip_payload(payload) == "Oslo, Oslo, Norway"
+
+
+def test_location_from_ip_payload_skips_blank_aliases() -> None:
+    payload = {"city": None, "region": "  ", "regionName": "Bavaria", "country": "Germany"}
+
+    assert _location_from_ip_payload(payload) == "Bavaria, Germany"
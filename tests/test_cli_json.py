@@ -0,0 +1,47 @@
+"""Unit tests for CLI JSON output."""
+
+from __future__ import annotations
+
+import json
+from datetime import datetime, timedelta
+from zoneinfo import ZoneInfo
+
+from iss_horizon.cli import _NON_ASCII_RE, _dumps_json, _escape_non_ascii, _window_to_dict
+from iss_horizon.models import VisibilityWindow
+
+
+def test_window_json_roundtrip_keeps_schema() -> None:
+    tz = ZoneInfo("America/Fortaleza")
+    window = VisibilityWindow(
+        start_local=datetime(2026, 3, 2, 19, 0, 0, tzinfo=tz),
+        end_local=datetime(2026, 3, 2, 19, 2, 30, tzinfo=tz),
+        peak_local=datetime(2026, 3, 2, 19, 1, 10, tzinfo=tz),
+        duration=timedelta(minutes=2, seconds=30),
+        peak_elevation_deg=42.3456,
+        start_azimuth_deg=250.104,
+        peak_azimuth_deg=270.5,
+        end_azimuth_deg=290.3,
+        start_direction="WSW",
+        peak_direction="W",
+        end_direction="WNW",
+        visibility_stars=4,
+    )
+
+    text = _dumps_json({"windows": [_window_to_dict(window)]})
+    data = json.loads(text)["windows"][0]
+
+    assert text.isascii()
+    assert text == json.dumps({"windows": [_window_to_dict(window)]}, indent=2)
+    assert data["start_local"] == "2026-03-02T19:00:00-03:00"
+    assert data["duration_seconds"] == 150
+    assert data["peak_elevation_deg"] == 42.35
+    assert data["start_azimuth_deg"] == 250.1
+    assert data["visibility_label"] == "★★★★☆"
+
+
+def test_non_ascii_escapes_match_json_module() -> None:
+    text = "Zürich ★☆ 🛰"
+
+    escaped = _NON_ASCII_RE.sub(_escape_non_ascii, text)
+
+    assert escaped == json.dumps(text)[1:-1]
@@ -0,0 +1,38 @@
+"""Unit tests for CLI argument parsing."""
+
+from __future__ import annotations
+
+import pytest
+
+from iss_horizon.cli import _build_parser, main
+
+
+def test_build_parser_registers_only_requested_subcommand() -> None:
+    parser = _build_parser("next")
+
+    args = parser.parse_args(["next", "--location", "Natal", "--hours", "12"])
+
+    assert args.command == "next"
+    assert args.hours == 12
+    with pytest.raises(SystemExit):
+        parser.parse_args(["config"])
+
+
+def test_build_parser_without_command_registers_all_subcommands() -> None:
+    parser = _build_parser(None)
+
+    args = parser.parse_args(["config"])
+
+    assert args.command == "config"
+
+
+def test_build_parser_unknown_command_is_rejected() -> None:
+    parser = _build_parser("bogus")
+
+    with pytest.raises(SystemExit):
+        parser.parse_args(["bogus"])
+
+
+def test_main_dispatches_config_command(capsys: pytest.CaptureFixture[str]) -> None:
+    assert main(["config"]) == 0
+    assert '"ISS_TLE_NAME"' in capsys.readouterr().out
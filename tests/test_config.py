@@ -0,0 +1,22 @@
+"""Unit tests for environment-backed configuration."""
+
+from __future__ import annotations
+
+import pytest
+
+from iss_horizon.config import Config
+
+
+def test_from_env_is_cached_until_cleared(monkeypatch: pytest.MonkeyPatch) -> None:
+    Config.from_env.cache_clear()
+    monkeypatch.setenv("ISS_MIN_ELEV_DEG", "20")
+
+    first = Config.from_env()
+    monkeypatch.setenv("ISS_MIN_ELEV_DEG", "30")
+
+    assert Config.from_env() is first
+    assert first.min_elev_deg == 20.0
+
+    Config.from_env.cache_clear()
+    assert Config.from_env().min_elev_deg == 30.0
+    Config.from_env.cache_clear()
@@ -2,29 +2,33 @@
 
 from __future__ import annotations
 
+import json
+import time
+from pathlib import Path
 from types import SimpleNamespace
 from unittest.mock import MagicMock, patch
 
 import pytest
 
-from iss_horizon.geo import LocationResolver
+from iss_horizon.geo import LocationResolver, _load_disk_cache, _shared_tz_finder
 from iss_horizon.models import LocationResolutionError
 
 
+@pytest.fixture(autouse=True)
+def _reset_shared_tz_finder() -> None:
+    _shared_tz_finder.cache_clear()
+
+
 @patch("iss_horizon.geo.TimezoneFinder")
 @patch("iss_horizon.geo.Nominatim")
 def test_resolve_success(nominatim_cls: MagicMock, timezonefinder_cls: MagicMock) -> None:
-    geocoder = MagicMock()
-    geocoder.geocode.return_value = SimpleNamespace(
+    place = SimpleNamespace(
         latitude=-5.79,
         longitude=-35.2,
         address="Natal, Rio Grande do Norte, Brazil",
     )
-    nominatim_cls.return_value = geocoder
-
-    finder = MagicMock()
-    finder.timezone_at.return_value = "America/Fortaleza"
-    timezonefinder_cls.return_value = finder
+    nominatim_cls.return_value = SimpleNamespace(geocode=lambda *_, **__: place)
+    timezonefinder_cls.return_value = SimpleNamespace(timezone_at=lambda **_: "America/Fortaleza")
 
     resolver = LocationResolver(user_agent="iss-horizon-test")
     result = resolver.resolve("Natal, RN, Brazil")
@@ -37,10 +41,8 @@ def test_resolve_success(nominatim_cls: MagicMock, timezonefinder_cls: MagicMock
 @patch("iss_horizon.geo.TimezoneFinder")
 @patch("iss_horizon.geo.Nominatim")
 def test_resolve_not_found(nominatim_cls: MagicMock, timezonefinder_cls: MagicMock) -> None:
-    geocoder = MagicMock()
-    geocoder.geocode.return_value = None
-    nominatim_cls.return_value = geocoder
-    timezonefinder_cls.return_value = MagicMock()
+    nominatim_cls.return_value = SimpleNamespace(geocode=lambda *_, **__: None)
+    timezonefinder_cls.return_value = SimpleNamespace()
 
     resolver = LocationResolver(user_agent="iss-horizon-test")
     with pytest.raises(LocationResolutionError, match="not found"):
@@ -50,22 +52,61 @@ def test_resolve_not_found(nominatim_cls: MagicMock, timezonefinder_cls: MagicMo
 @patch("iss_horizon.geo.TimezoneFinder")
 @patch("iss_horizon.geo.Nominatim")
 def test_resolve_timezone_failure(nominatim_cls: MagicMock, timezonefinder_cls: MagicMock) -> None:
+    place = SimpleNamespace(latitude=1.0, longitude=2.0, address="X")
+    nominatim_cls.return_value = SimpleNamespace(geocode=lambda *_, **__: place)
+    timezonefinder_cls.return_value = SimpleNamespace(timezone_at=lambda **_: None)
+
+    resolver = LocationResolver(user_agent="iss-horizon-test")
+    with pytest.raises(LocationResolutionError, match="Timezone"):
+        resolver.resolve("X")
+
+
+@patch("iss_horizon.geo.TimezoneFinder")
+@patch("iss_horizon.geo.Nominatim")
+def test_resolve_uses_cache(nominatim_cls: MagicMock, timezonefinder_cls: MagicMock) -> None:
+    geocoder = MagicMock()
+    geocoder.geocode.return_value = SimpleNamespace(
+        latitude=48.13,
+        longitude=11.58,
+        address="Munich, Bavaria, Germany",
+    )
+    nominatim_cls.return_value = geocoder
+
+    timezonefinder_cls.return_value = SimpleNamespace(timezone_at=lambda **_: "Europe/Berlin")
+
+    resolver = LocationResolver(user_agent="iss-horizon-test")
+    first = resolver.resolve("Munich")
+    second = resolver.resolve("Munich")
+
+    assert first == second
+    geocoder.geocode.assert_called_once()
+
+
+@patch("iss_horizon.geo.TimezoneFinder")
+@patch("iss_horizon.geo.Nominatim")
+def test_resolve_reuses_geocoder_and_timezone_finder(
+    nominatim_cls: MagicMock, timezonefinder_cls: MagicMock
+) -> None:
     geocoder = MagicMock()
     geocoder.geocode.return_value = SimpleNamespace(latitude=1.0, longitude=2.0, address="X")
     nominatim_cls.return_value = geocoder
 
-    finder = MagicMock()
-    finder.timezone_at.return_value = None
-    timezonefinder_cls.return_value = finder
+    timezonefinder_cls.return_value = SimpleNamespace(timezone_at=lambda **_: "UTC")
 
     resolver = LocationResolver(user_agent="iss-horizon-test")
-    with pytest.raises(LocationResolutionError, match="Timezone"):
-        resolver.resolve("X")
+    resolver.resolve("A")
+    resolver.resolve("B")
+    LocationResolver(user_agent="iss-horizon-test").resolve("C")
+
+    assert nominatim_cls.call_count == 2
+    timezonefinder_cls.assert_called_once()
 
 
 @patch("iss_horizon.geo.TimezoneFinder")
 @patch("iss_horizon.geo.Nominatim")
-def test_resolve_uses_cache(nominatim_cls: MagicMock, timezonefinder_cls: MagicMock) -> None:
+def test_resolve_uses_disk_cache_across_processes(
+    nominatim_cls: MagicMock, timezonefinder_cls: MagicMock, _isolated_cache_dir: Path
+) -> None:
     geocoder = MagicMock()
     geocoder.geocode.return_value = SimpleNamespace(
         latitude=48.13,
@@ -78,9 +119,95 @@ def test_resolve_uses_cache(nominatim_cls: MagicMock, timezonefinder_cls: MagicM
     finder.timezone_at.return_value = "Europe/Berlin"
     timezonefinder_cls.return_value = finder
 
-    resolver = LocationResolver(user_agent="iss-horizon-test")
-    first = resolver.resolve("Munich")
-    second = resolver.resolve("Munich")
+    first = LocationResolver(user_agent="iss-horizon-test").resolve("Munich")
+    _load_disk_cache.cache_clear()
+    second = LocationResolver(user_agent="iss-horizon-test").resolve("Munich")
 
+    assert (_isolated_cache_dir / "locations.json").is_file()
     assert first == second
     geocoder.geocode.assert_called_once()
+    finder.timezone_at.assert_called_once()
+
+
+def _munich_geocoder(nominatim_cls: MagicMock, timezonefinder_cls: MagicMock) -> MagicMock:
+    geocoder = MagicMock()
+    geocoder.geocode.return_value = SimpleNamespace(
+        latitude=48.13,
+        longitude=11.58,
+        address="Munich, Bavaria, Germany",
+    )
+    nominatim_cls.return_value = geocoder
+
+    timezonefinder_cls.return_value = SimpleNamespace(timezone_at=lambda **_: "Europe/Berlin")
+    return geocoder
+
+
+@patch("iss_horizon.geo.TimezoneFinder")
+@patch("iss_horizon.geo.Nominatim")
+def test_resolve_cache_ignores_case_and_whitespace(
+    nominatim_cls: MagicMock, timezonefinder_cls: MagicMock
+) -> None:
+    geocoder = _munich_geocoder(nominatim_cls, timezonefinder_cls)
+
+    LocationResolver(user_agent="iss-horizon-test").resolve("Munich")
+    _load_disk_cache.cache_clear()
+    second = LocationResolver(user_agent="iss-horizon-test").resolve("  MUNICH ")
+
+    assert second.query == "MUNICH"
+    assert second.timezone_name == "Europe/Berlin"
+    geocoder.geocode.assert_called_once()
+
+
+@patch("iss_horizon.geo.TimezoneFinder")
+@patch("iss_horizon.geo.Nominatim")
+def test_resolve_refreshes_expired_disk_entries(
+    nominatim_cls: MagicMock, timezonefinder_cls: MagicMock
+) -> None:
+    geocoder = _munich_geocoder(nominatim_cls, timezonefinder_cls)
+
+    LocationResolver(user_agent="iss-horizon-test").resolve("Munich")
+    _load_disk_cache.cache_clear()
+    with patch("iss_horizon.geo.time.time", return_value=time.time() + 31 * 24 * 3600):
+        LocationResolver(user_agent="iss-horizon-test").resolve("Munich")
+
+    assert geocoder.geocode.call_count == 2
+
+
+@patch("iss_horizon.geo.TimezoneFinder")
+@patch("iss_horizon.geo.Nominatim")
+def test_store_prunes_expired_disk_entries(
+    nominatim_cls: MagicMock, timezonefinder_cls: MagicMock, _isolated_cache_dir: Path
+) -> None:
+    _munich_geocoder(nominatim_cls, timezonefinder_cls)
+
+    LocationResolver(user_agent="iss-horizon-test").resolve("Munich")
+    _load_disk_cache.cache_clear()
+    with patch("iss_horizon.geo.time.time", return_value=time.time() + 31 * 24 * 3600):
+        LocationResolver(user_agent="iss-horizon-test").resolve("Berlin")
+
+    entries = json.loads((_isolated_cache_dir / "locations.json").read_text(encoding="utf-8"))
+    assert list(entries) == ["berlin"]
+
+
+@patch("iss_horizon.geo.TimezoneFinder")
+@patch("iss_horizon.geo.Nominatim")
+def test_resolve_treats_malformed_disk_entry_as_miss(
+    nominatim_cls: MagicMock, timezonefinder_cls: MagicMock, _isolated_cache_dir: Path
+) -> None:
+    geocoder = _munich_geocoder(nominatim_cls, timezonefinder_cls)
+    entry = {
+        "resolved_name": "Munich",
+        "latitude": "not a number",
+        "longitude": 11.58,
+        "timezone_name": "Nowhere/Invalid",
+        "cached_at": time.time(),
+    }
+    _isolated_cache_dir.mkdir(parents=True, exist_ok=True)
+    (_isolated_cache_dir / "locations.json").write_text(
+        json.dumps({"munich": entry}), encoding="utf-8"
+    )
+
+    location = LocationResolver(user_agent="iss-horizon-test").resolve("Munich")
+
+    assert location.timezone_name == "Europe/Berlin"
+    geocoder.geocode.assert_called_once()
@@ -2,11 +2,13 @@
 
 from __future__ import annotations
 
+import smtplib
+from email.message import EmailMessage
 from unittest.mock import MagicMock, patch
 
 import pytest
 
-from iss_horizon.mailer import send_mail
+from iss_horizon.mailer import SMTPSession, build_message, send_mail, send_mails
 from iss_horizon.models import EmailSendError, SMTPConfig
 
 
@@ -63,3 +65,83 @@ def test_send_mail_rejects_missing_host() -> None:
     cfg = SMTPConfig(host="", port=465, user=None, password=None, from_addr="f@x", tls_mode="ssl")
     with pytest.raises(EmailSendError, match="SMTP_HOST"):
         send_mail("s", "b", "t@example.com", smtp_config=cfg)
+
+
+def test_smtp_session_reuses_one_connection() -> None:
+    cfg = SMTPConfig(
+        host="smtp.example.com",
+        port=465,
+        user="u",
+        password="p",
+        from_addr="from@example.com",
+        tls_mode="ssl",
+    )
+
+    smtp_instance = MagicMock()
+
+    with (
+        patch("smtplib.SMTP_SSL", return_value=smtp_instance) as smtp_cls,
+        SMTPSession(cfg) as session,
+    ):
+        for to_addr in ("a@example.com", "b@example.com"):
+            msg = EmailMessage()
+            msg["To"] = to_addr
+            msg.set_content("body")
+            session.send(msg, to_addr)
+
+    smtp_cls.assert_called_once()
+    smtp_instance.login.assert_called_once_with("u", "p")
+    assert smtp_instance.send_message.call_count == 2
+    smtp_instance.quit.assert_called_once()
+
+
+def test_smtp_session_send_requires_open_session() -> None:
+    cfg = SMTPConfig(host="h", port=465, user=None, password=None, from_addr="f@x", tls_mode="ssl")
+    with pytest.raises(EmailSendError, match="not open"):
+        SMTPSession(cfg).send(EmailMessage(), "t@example.com")
+
+
+def test_build_message_adds_quoted_printable_html_alternative() -> None:
+    html_body = "<html><body><p>★★★☆☆</p></body></html>"
+
+    msg = build_message(
+        "sub", "body", from_addr="from@example.com", to_addr="to@example.com", html_body=html_body
+    )
+
+    html_part = msg.get_body(preferencelist=("html",))
+    assert html_part is not None
+    assert html_part["Content-Transfer-Encoding"] == "quoted-printable"
+    assert html_part.get_content().strip() == html_body
+    assert msg["To"] == "to@example.com"
+
+
+def test_send_mails_resets_and_continues_after_rejection() -> None:
+    cfg = SMTPConfig(
+        host="smtp.example.com",
+        port=465,
+        user="u",
+        password="p",
+        from_addr="from@example.com",
+        tls_mode="ssl",
+    )
+    smtp_instance = MagicMock()
+    smtp_instance.send_message.side_effect = [
+        smtplib.SMTPDataError(550, b"rejected"),
+        {},
+    ]
+    messages = [
+        (build_message("s", "b", from_addr="from@example.com", to_addr=to), to)
+        for to in ("bad@example.com", "ok@example.com")
+    ]
+
+    with (
+        patch("smtplib.SMTP_SSL", return_value=smtp_instance) as smtp_cls,
+        pytest.raises(EmailSendError, match="bad@example.com"),
+    ):
+        send_mails(messages, smtp_config=cfg)
+
+    smtp_cls.assert_called_once()
+    smtp_instance.login.assert_called_once_with("u", "p")
+    assert smtp_instance.send_message.call_count == 2
+    smtp_instance.rset.assert_called_once()
+    smtp_instance.quit.assert_called_once()
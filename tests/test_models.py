@@ -0,0 +1,41 @@
+"""Unit tests for domain model validation."""
+
+from __future__ import annotations
+
+from datetime import UTC, datetime, timedelta
+from typing import Any
+
+import pytest
+
+from iss_horizon.models import VisibilityWindow
+
+
+def _window_fields(**overrides: Any) -> dict[str, Any]:
+    start = datetime(2026, 3, 2, 22, 0, 0, tzinfo=UTC)
+    fields: dict[str, Any] = {
+        "start_local": start,
+        "end_local": start + timedelta(minutes=2),
+        "peak_local": start + timedelta(minutes=1),
+        "duration": timedelta(minutes=2),
+        "peak_elevation_deg": 42.0,
+        "start_azimuth_deg": 250.0,
+        "peak_azimuth_deg": 270.0,
+        "end_azimuth_deg": 290.0,
+        "start_direction": "WSW",
+        "peak_direction": "W",
+        "end_direction": "WNW",
+        "visibility_stars": 3,
+    }
+    fields.update(overrides)
+    return fields
+
+
+def test_visibility_window_rejects_naive_times() -> None:
+    with pytest.raises(ValueError, match="peak_local must be timezone-aware"):
+        VisibilityWindow(**_window_fields(peak_local=datetime(2026, 3, 2, 22, 1, 0)))
+
+
+def test_visibility_window_unchecked_matches_validated_constructor() -> None:
+    fields = _window_fields()
+
+    assert VisibilityWindow.unchecked(**fields) == VisibilityWindow(**fields)
@@ -2,12 +2,19 @@
 
 from __future__ import annotations
 
+from dataclasses import replace
 from datetime import UTC, datetime, timedelta
+from unittest.mock import MagicMock, patch
 from zoneinfo import ZoneInfo
 
+import numpy as np
+import pytest
+from skyfield.api import load
+
 from iss_horizon.config import Config
-from iss_horizon.models import Location
-from iss_horizon.predictor import ISSPredictor
+from iss_horizon.models import Location, PredictionError
+from iss_horizon.predictor import ISSPredictor, SampleBatch
+from iss_horizon.tle import _BUNDLED_ISS_TLE
 
 
 def _location() -> Location:
@@ -73,3 +80,127 @@ def test_windows_from_samples_filters_short_spans() -> None:
     )
 
     assert windows == []
+
+
+def test_skyfield_objects_are_loaded_once_per_predictor() -> None:
+    loader = MagicMock()
+    loader.timescale.return_value = load.timescale(builtin=True)
+    loader.return_value = {"earth": "earth-segment", "sun": "sun-segment"}
+    predictor = ISSPredictor(config=Config(), loader=loader)
+
+    assert predictor.ts is predictor.ts
+    assert predictor.earth == "earth-segment"
+    assert predictor.sun == "sun-segment"
+    assert predictor.eph is predictor.eph
+    loader.timescale.assert_called_once_with()
+    loader.assert_called_once_with("de421.bsp")
+
+
+def test_satellite_is_rebuilt_only_when_the_tle_changes() -> None:
+    loader = MagicMock()
+    loader.timescale.return_value = load.timescale(builtin=True)
+    predictor = ISSPredictor(config=Config(), loader=loader)
+    newer = replace(_BUNDLED_ISS_TLE, line1=_BUNDLED_ISS_TLE.line1.replace("26051", "26052"))
+
+    with patch("iss_horizon.predictor.fetch_tle", return_value=_BUNDLED_ISS_TLE) as fetch:
+        satellite = predictor.satellite
+        assert predictor.satellite is satellite
+        fetch.return_value = newer
+        refreshed = predictor.satellite
+
+    assert refreshed is not satellite
+    assert refreshed.model.jdsatepoch > satellite.model.jdsatepoch
+
+
+def test_windows_from_samples_accepts_posix_seconds() -> None:
+    predictor = ISSPredictor(config=Config(min_elev_deg=15.0, min_window_seconds=20))
+    start = datetime(2026, 3, 1, 0, 0, 0, 250_000, tzinfo=UTC)
+    samples = [start + timedelta(seconds=i * 10) for i in range(6)]
+    arrays = {
+        "iss_alt_deg": [5.0, 16.0, 24.0, 23.0, 12.0, 4.0],
+        "iss_az_deg": [200.0, 220.0, 250.0, 280.0, 300.0, 320.0],
+        "sun_alt_deg": [-15.0] * 6,
+        "iss_sunlit": [True] * 6,
+    }
+
+    from_datetimes = predictor._windows_from_samples(
+        loc=_location(), sample_times_utc=samples, **arrays
+    )
+    from_seconds = predictor._windows_from_samples(
+        loc=_location(),
+        sample_times_utc=np.array([dt.timestamp() for dt in samples]),
+        **arrays,
+    )
+
+    assert from_seconds == from_datetimes
+    assert from_seconds[0].start_local == samples[1]
+
+
+def test_windows_from_samples_returns_spans_in_start_order() -> None:
+    predictor = ISSPredictor(config=Config(min_elev_deg=15.0, min_window_seconds=10))
+    start = datetime(2026, 3, 1, 0, 0, 0, tzinfo=UTC)
+    samples = [start + timedelta(seconds=i * 10) for i in range(8)]
+
+    windows = predictor._windows_from_samples(
+        loc=_location(),
+        sample_times_utc=samples,
+        iss_alt_deg=[16.0, 20.0, 5.0, 18.0, 30.0, 4.0, 22.0, 25.0],
+        iss_az_deg=[10.0 * i for i in range(8)],
+        sun_alt_deg=[-15.0] * 8,
+        iss_sunlit=[True] * 8,
+    )
+
+    starts = [win.start_local for win in windows]
+    assert len(starts) == 3
+    assert starts == sorted(starts)
+
+
+def test_sample_batch_rejects_mismatched_columns() -> None:
+    with pytest.raises(PredictionError):
+        SampleBatch.from_samples(
+            sample_times_utc=np.array([0.0, 10.0, 20.0]),
+            iss_alt_deg=[10.0, 20.0, 30.0],
+            iss_az_deg=[0.0, 90.0],
+            sun_alt_deg=[-15.0] * 3,
+            iss_sunlit=[True] * 3,
+        )
+
+
+def test_sample_batch_rows_are_views() -> None:
+    batch = SampleBatch.from_samples(
+        sample_times_utc=np.arange(5, dtype=np.float64),
+        iss_alt_deg=np.arange(5, dtype=np.float64),
+        iss_az_deg=np.zeros(5),
+        sun_alt_deg=np.zeros(5),
+        iss_sunlit=np.ones(5, dtype=bool),
+    )
+
+    part = batch.rows(1, 3)
+
+    assert len(part) == 2
+    assert part.alt.tolist() == [1.0, 2.0]
+    assert np.shares_memory(part.alt, batch.alt)
+
+
+def test_windows_from_samples_skips_daylight_pass_without_scanning() -> None:
+    predictor = ISSPredictor(config=Config(min_elev_deg=15.0, min_window_seconds=10))
+    arrays = {
+        "sample_times_utc": np.arange(0.0, 60.0, 10.0),
+        "iss_alt_deg": [20.0, 30.0, 40.0, 30.0, 20.0, 10.0],
+        "iss_az_deg": [0.0] * 6,
+        "iss_sunlit": [True] * 6,
+    }
+
+    with patch("iss_horizon.predictor.scan_spans") as scan:
+        daylight = predictor._windows_from_samples(
+            loc=_location(), sun_alt_deg=[5.0, 4.0, 3.0, 2.0, np.nan, 1.0], **arrays
+        )
+        unlit = predictor._windows_from_samples(
+            loc=_location(),
+            sun_alt_deg=[-20.0] * 6,
+            **{**arrays, "iss_sunlit": [False] * 6},
+        )
+
+    assert daylight == []
+    assert unlit == []
+    scan.assert_not_called()
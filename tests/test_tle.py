@@ -2,24 +2,49 @@
 
 from __future__ import annotations
 
+import os
+import time
+from collections.abc import Iterable, Iterator
+from types import SimpleNamespace
 from unittest.mock import MagicMock, patch
 
 import pytest
 import requests
 
+from iss_horizon import tle as tle_module
 from iss_horizon.models import TLEFetchError
 from iss_horizon.tle import fetch_tle
 
-
-@patch("iss_horizon.tle.requests.get")
-def test_fetch_tle_success(get_mock: MagicMock) -> None:
-    response = MagicMock()
-    response.text = """ISS (ZARYA)
+_ISS_TLE_TEXT = """ISS (ZARYA)
 1 25544U 98067A   26051.50000000  .00010000  00000+0  18277-3 0  9991
 2 25544  51.6417 200.0000 0005825 100.0000 300.0000 15.50000000000000
 """
-    response.raise_for_status.return_value = None
-    get_mock.return_value = response
+
+
+def _response(
+    lines: Iterable[str] = (),
+    *,
+    status_code: int = 200,
+    error: Exception | None = None,
+    closed: list[bool] | None = None,
+) -> SimpleNamespace:
+    """Plain stand-in for a streamed ``requests.Response``."""
+
+    def raise_for_status() -> None:
+        if error is not None:
+            raise error
+
+    return SimpleNamespace(
+        status_code=status_code,
+        raise_for_status=raise_for_status,
+        iter_lines=lambda **_: iter(lines),
+        close=lambda: closed.append(True) if closed is not None else None,
+    )
+
+
+@patch("iss_horizon.tle._SESSION.get")
+def test_fetch_tle_success(get_mock: MagicMock) -> None:
+    get_mock.return_value = _response(_ISS_TLE_TEXT.splitlines())
 
     tle = fetch_tle("ISS (ZARYA)", "https://example.test/success.txt")
 
@@ -28,53 +53,148 @@ def test_fetch_tle_success(get_mock: MagicMock) -> None:
     assert tle.line2.startswith("2 ")
 
 
-@patch("iss_horizon.tle.requests.get")
+@patch("iss_horizon.tle._SESSION.get")
+def test_fetch_tle_stops_reading_after_match(get_mock: MagicMock) -> None:
+    def lines() -> Iterator[str]:
+        yield "ISS (ZARYA)"
+        yield "1 25544U 98067A   26051.50000000  .00010000  00000+0  18277-3 0  9991"
+        yield "2 25544  51.6417 200.0000 0005825 100.0000 300.0000 15.50000000000000"
+        raise AssertionError("read past the matching TLE")
+
+    closed: list[bool] = []
+    get_mock.return_value = _response(lines(), closed=closed)
+
+    tle = fetch_tle("ISS (ZARYA)", "https://example.test/stream.txt")
+
+    assert tle.line1.startswith("1 25544U")
+    assert get_mock.call_args.kwargs["stream"] is True
+    assert closed == [True]
+
+
+@patch("iss_horizon.tle._SESSION.get")
 def test_fetch_tle_not_found(get_mock: MagicMock) -> None:
-    response = MagicMock()
-    response.text = """OTHER SAT
+    get_mock.return_value = _response(
+        """OTHER SAT
 1 00000U 00000A   26051.50000000  .00000000  00000+0  00000-0 0  9991
 2 00000  00.0000 000.0000 0000000 000.0000 000.0000 01.00000000000000
-"""
-    response.raise_for_status.return_value = None
-    get_mock.return_value = response
+""".splitlines()
+    )
 
     with pytest.raises(TLEFetchError, match="not found"):
         fetch_tle("ISS (ZARYA)", "https://example.test/not-found.txt")
 
 
-@patch("iss_horizon.tle.requests.get")
+@patch("iss_horizon.tle._SESSION.get")
 def test_fetch_tle_request_error(get_mock: MagicMock) -> None:
     get_mock.side_effect = requests.RequestException("boom")
     tle = fetch_tle("ISS (ZARYA)", "https://example.test/error.txt")
     assert tle.name == "ISS (ZARYA)"
 
 
-@patch("iss_horizon.tle.requests.get")
+@patch("iss_horizon.tle._SESSION.get")
 def test_fetch_tle_request_error_non_iss_still_fails(get_mock: MagicMock) -> None:
     get_mock.side_effect = requests.RequestException("boom")
     with pytest.raises(TLEFetchError, match="Failed to fetch"):
         fetch_tle("NOT-ISS", "https://example.test/error-non-iss.txt")
 
 
-@patch("iss_horizon.tle.requests.get")
+@patch("iss_horizon.tle._SESSION.get")
 def test_fetch_tle_fallback_from_stations_403_to_gp(get_mock: MagicMock) -> None:
-    forbidden_response = MagicMock()
-    forbidden_response.status_code = 403
-    forbidden_error = requests.HTTPError("403", response=forbidden_response)
-
-    first_response = MagicMock()
-    first_response.raise_for_status.side_effect = forbidden_error
+    forbidden = requests.Response()
+    forbidden.status_code = 403
+    forbidden_error = requests.HTTPError("403", response=forbidden)
 
-    second_response = MagicMock()
-    second_response.raise_for_status.return_value = None
-    second_response.text = """ISS (ZARYA)
-1 25544U 98067A   26051.50000000  .00010000  00000+0  18277-3 0  9991
-2 25544  51.6417 200.0000 0005825 100.0000 300.0000 15.50000000000000
-"""
-
-    get_mock.side_effect = [first_response, second_response]
+    get_mock.side_effect = [
+        _response(status_code=403, error=forbidden_error),
+        _response(_ISS_TLE_TEXT.splitlines()),
+    ]
 
     tle = fetch_tle("ISS (ZARYA)", "https://celestrak.org/NORAD/elements/stations.txt")
 
     assert tle.name == "ISS (ZARYA)"
     assert get_mock.call_count == 2
+
+
+def _iss_response(status_code: int = 200) -> SimpleNamespace:
+    return _response(
+        """ISS (ZARYA)
+1 25544U 98067A   26100.50000000  .00010000  00000+0  18277-3 0  9991
+2 25544  51.6417 210.0000 0005825 100.0000 300.0000 15.50000000000000
+""".splitlines(),
+        status_code=status_code,
+    )
+
+
+@patch("iss_horizon.tle._SESSION.get")
+def test_fetch_tle_reuses_fresh_disk_cache(
+    get_mock: MagicMock, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    get_mock.return_value = _iss_response()
+    url = "https://example.test/disk-fresh.txt"
+    first = fetch_tle("ISS (ZARYA)", url)
+
+    monkeypatch.setattr(tle_module, "_TLE_CACHE", {})
+    second = fetch_tle("ISS (ZARYA)", url)
+
+    assert second == first
+    assert get_mock.call_count == 1
+
+
+@patch("iss_horizon.tle._SESSION.get")
+def test_fetch_tle_revalidates_stale_disk_cache(
+    get_mock: MagicMock, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    get_mock.return_value = _iss_response()
+    url = "https://example.test/disk-stale.txt"
+    first = fetch_tle("ISS (ZARYA)", url)
+    path = tle_module._disk_cache_path("ISS (ZARYA)", url)
+    os.utime(path, (0, 0))
+
+    monkeypatch.setattr(tle_module, "_TLE_CACHE", {})
+    get_mock.return_value = _iss_response(status_code=304)
+    second = fetch_tle("ISS (ZARYA)", url)
+
+    assert second == first
+    assert "If-Modified-Since" in get_mock.call_args.kwargs["headers"]
+    assert path.stat().st_mtime > 0
+
+
+@patch("iss_horizon.tle._SESSION.get")
+def test_fetch_tle_prefers_stale_disk_cache_over_bundled(
+    get_mock: MagicMock, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    get_mock.return_value = _iss_response()
+    url = "https://example.test/disk-offline.txt"
+    cached = fetch_tle("ISS (ZARYA)", url)
+    os.utime(tle_module._disk_cache_path("ISS (ZARYA)", url), (0, 0))
+
+    monkeypatch.setattr(tle_module, "_TLE_CACHE", {})
+    get_mock.side_effect = requests.RequestException("offline")
+
+    assert fetch_tle("ISS (ZARYA)", url) == cached
+    assert cached != tle_module._BUNDLED_ISS_TLE
+
+
+def test_shared_session_retries_transient_https_errors() -> None:
+    adapter = tle_module._SESSION.get_adapter("https://celestrak.org/NORAD/elements/")
+    retries = adapter.max_retries
+
+    assert retries.total == 2
+    assert 503 in retries.status_forcelist
+    assert 403 not in retries.status_forcelist
+
+
+@patch("iss_horizon.tle._SESSION.get")
+def test_fetch_tle_memory_cache_expires(get_mock: MagicMock) -> None:
+    get_mock.return_value = _iss_response()
+    url = "https://example.test/memory-ttl.txt"
+    fetch_tle("ISS (ZARYA)", url)
+    fetch_tle("ISS (ZARYA)", url)
+    assert get_mock.call_count == 1
+
+    os.utime(tle_module._disk_cache_path("ISS (ZARYA)", url), (0, 0))
+    later = time.monotonic() + tle_module._CACHE_TTL_SECONDS + 1
+    with patch("iss_horizon.tle.time.monotonic", return_value=later):
+        fetch_tle("ISS (ZARYA)", url)
+
+    assert get_mock.call_count == 2
@@ -2,9 +2,24 @@
 
 from __future__ import annotations
 
+from pathlib import Path
+
+import numpy as np
 import pytest
 
-from iss_horizon.utils import az_to_cardinal, contiguous_true_spans, stars_text, visibility_stars
+from iss_horizon import utils
+from iss_horizon.utils import (
+    _scan_spans_kernel,
+    atomic_write_text,
+    az_to_cardinal,
+    az_to_cardinal_array,
+    contiguous_true_spans,
+    contiguous_true_spans_np,
+    scan_spans,
+    stars_text,
+    visibility_stars,
+    visibility_stars_batch,
+)
 
 
 @pytest.mark.parametrize(
@@ -41,6 +56,17 @@ def test_az_to_cardinal_supported_resolutions(azimuth: float, points: int, expec
 def test_az_to_cardinal_invalid_resolution() -> None:
     with pytest.raises(ValueError, match="points"):
         az_to_cardinal(30.0, points=12)
+    with pytest.raises(ValueError, match="points"):
+        az_to_cardinal_array([30.0], points=12)
+
+
+@pytest.mark.parametrize("points", [4, 8, 16])
+def test_az_to_cardinal_array_matches_scalar(points: int) -> None:
+    azimuths = [-1.0, 0.0, 11.24, 11.25, 44.0, 90.0, 348.75, 359.99, 721.0]
+
+    labels = az_to_cardinal_array(azimuths, points=points)
+
+    assert labels.tolist() == [az_to_cardinal(az, points=points) for az in azimuths]
 
 
 @pytest.mark.parametrize(
@@ -57,6 +83,9 @@ def test_az_to_cardinal_invalid_resolution() -> None:
 )
 def test_contiguous_true_spans(mask: list[bool], expected: list[tuple[int, int]]) -> None:
     assert contiguous_true_spans(mask) == expected
+    spans = contiguous_true_spans_np(np.array(mask, dtype=bool))
+    assert spans.shape == (len(expected), 2)
+    assert [tuple(span) for span in spans.tolist()] == expected
 
 
 @pytest.mark.parametrize(
@@ -73,5 +102,57 @@ def test_visibility_stars(peak: float, duration: float, expected: int) -> None:
     assert visibility_stars(peak, duration) == expected
 
 
+def test_visibility_stars_batch_matches_scalar_scores() -> None:
+    peaks = np.array([0.0, 19.9, 20.0, 39.9, 40.0, 64.9, 65.0, 90.0] * 2)
+    durations = np.array([60.0] * 8 + [120.0] * 8)
+
+    scores = visibility_stars_batch(peaks, durations)
+
+    expected = [visibility_stars(p, d) for p, d in zip(peaks, durations, strict=True)]
+    assert scores.dtype == np.int8
+    assert scores.tolist() == expected
+
+
 def test_stars_text() -> None:
     assert stars_text(3) == "★★★☆☆"
+
+
+@pytest.mark.parametrize("seed", range(5))
+def test_scan_spans_kernel_matches_numpy_path(seed: int, monkeypatch: pytest.MonkeyPatch) -> None:
+    # Force the NumPy fallback even when numba is installed.
+    monkeypatch.setattr(utils, "_compiled_scan_spans", lambda: None)
+    rng = np.random.default_rng(seed)
+    n = 200
+    iss_alt = rng.uniform(-10.0, 80.0, n).round(0)
+    sun_alt = rng.uniform(-30.0, 5.0, n)
+    sun_alt[rng.random(n) < 0.1] = np.nan
+    sunlit = rng.random(n) < 0.8
+
+    numpy_spans = scan_spans(iss_alt, sun_alt, sunlit, 10.0, -6.0)
+    kernel_spans = _scan_spans_kernel(iss_alt, sun_alt, sunlit, 10.0, -6.0)
+
+    assert numpy_spans.shape[1] == 3
+    assert kernel_spans.tolist() == numpy_spans.tolist()
+
+
+def test_scan_spans_reports_start_peak_end() -> None:
+    spans = scan_spans(
+        [5.0, 16.0, 24.0, 24.0, 4.0, 30.0],
+        [-15.0] * 6,
+        [True] * 6,
+        min_elev=10.0,
+        twilight=-12.0,
+    )
+    assert spans.tolist() == [[1, 2, 3], [5, 5, 5]]
+    assert scan_spans([], [], [], 10.0, -12.0).shape == (0, 3)
+
+
+def test_atomic_write_text_removes_temp_file_when_write_fails(tmp_path: Path) -> None:
+    target = tmp_path / "cache.json"
+    target.write_text("old", encoding="utf-8")
+
+    with pytest.raises(UnicodeEncodeError):
+        atomic_write_text(target, "\ud800")  # a lone surrogate cannot be encoded
+
+    assert target.read_text(encoding="utf-8") == "old"
+    assert sorted(p.name for p in tmp_path.iterdir()) == ["cache.json"]